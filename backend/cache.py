@@ -0,0 +1,170 @@
+"""In-process and on-disk caches for external lookups keyed by DOI."""
+import asyncio
+import functools
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+import orjson
+import config
+
+logger = logging.getLogger(__name__)
+
+# Successful lookups are kept for an hour, failed ones only briefly
+POSITIVE_TTL = 3600.0
+NEGATIVE_TTL = 60.0
+
+# Maximum number of in-memory entries per cached function
+MAXSIZE = 256
+
+# Entries on disk expire after 90 days
+DISK_TTL = 90 * 24 * 3600.0
+
+# Scraped pages that yielded no PDF link are retried after a day
+PAGE_MISS_TTL = 24 * 3600.0
+
+
+def async_ttl_cache(
+    ttl: float = POSITIVE_TTL,
+    negative_ttl: float = NEGATIVE_TTL,
+    is_hit: Callable[[Any], bool] = bool,
+    maxsize: int = MAXSIZE,
+):
+    """Cache an async function's result by its first argument.
+
+    Concurrent calls for the same key share a single in-flight request.
+    Results for which `is_hit` is false are cached for `negative_ttl` only.
+    Expired entries are dropped when read and whenever an entry is added,
+    and at most `maxsize` entries are kept, evicting the least recently used.
+    """
+    def decorator(func: Callable[..., Awaitable[Any]]):
+        entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        locks: Dict[str, asyncio.Lock] = {}
+
+        def lookup(key: str) -> Tuple[bool, Any]:
+            entry = entries.get(key)
+            if entry is None:
+                return False, None
+            if entry[0] <= time.monotonic():
+                del entries[key]
+                return False, None
+            entries.move_to_end(key)
+            return True, entry[1]
+
+        def purge_expired() -> None:
+            now = time.monotonic()
+            for expired in [k for k, (expires, _) in entries.items() if expires <= now]:
+                del entries[expired]
+
+        @functools.wraps(func)
+        async def wrapper(key: str, *args, **kwargs):
+            found, result = lookup(key)
+            if found:
+                return result
+
+            lock = locks.setdefault(key, asyncio.Lock())
+            async with lock:
+                # Another caller may have filled the entry while we waited
+                found, result = lookup(key)
+                if found:
+                    return result
+
+                result = await func(key, *args, **kwargs)
+                purge_expired()
+                expires = time.monotonic() + (ttl if is_hit(result) else negative_ttl)
+                entries[key] = (expires, result)
+                entries.move_to_end(key)
+                while len(entries) > maxsize:
+                    entries.popitem(last=False)
+
+            if not lock.locked():
+                locks.pop(key, None)
+            return result
+
+        def cache_clear() -> None:
+            entries.clear()
+            locks.clear()
+
+        wrapper.cache_clear = cache_clear
+        return wrapper
+
+    return decorator
+
+
+def async_single_flight(func: Callable[..., Awaitable[Any]]):
+    """Share one in-flight call among concurrent callers with the same first argument.
+
+    Nothing is kept once the call finishes, so later calls always run afresh.
+    """
+    inflight: Dict[str, asyncio.Future] = {}
+
+    @functools.wraps(func)
+    async def wrapper(key: str, *args, **kwargs):
+        future = inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(func(key, *args, **kwargs))
+            inflight[key] = future
+
+            def forget(done: asyncio.Future) -> None:
+                if inflight.get(key) is done:
+                    del inflight[key]
+
+            future.add_done_callback(forget)
+
+        # A cancelled caller mustn't cancel the call the others are waiting on
+        return await asyncio.shield(future)
+
+    return wrapper
+
+
+def _disk_cache_path(kind: str, key: str) -> Path:
+    """Get the on-disk cache file for a key."""
+    digest = hashlib.sha1(key.encode('utf-8')).hexdigest()
+    return config.LIBRARY_ROOT / ".cache" / kind / digest
+
+
+def disk_cache_get(kind: str, key: str, ttl: float = DISK_TTL) -> Optional[bytes]:
+    """Read a cached entry if it exists and is younger than `ttl` seconds."""
+    path = _disk_cache_path(kind, key)
+    try:
+        if time.time() - path.stat().st_mtime > ttl:
+            return None
+        with open(path, 'rb') as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning("Error reading %s cache for %s: %s", kind, key, e)
+        return None
+
+
+def disk_cache_put(kind: str, key: str, data: bytes) -> None:
+    """Write a cache entry; its age is tracked by the file's mtime."""
+    path = _disk_cache_path(kind, key)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(data)
+    except Exception as e:
+        logger.warning("Error writing %s cache for %s: %s", kind, key, e)
+
+
+def load_cached_metadata(doi: str) -> Optional[Tuple[Dict[str, Any], str]]:
+    """Load previously fetched metadata and its source from disk."""
+    data = disk_cache_get("metadata", doi.lower())
+    if data is None:
+        return None
+
+    try:
+        entry = orjson.loads(data)
+        return entry['metadata'], entry['source']
+    except Exception as e:
+        logger.warning("Error loading cached metadata for %s: %s", doi, e)
+        return None
+
+
+def save_cached_metadata(doi: str, metadata: Dict[str, Any], source: str) -> None:
+    """Persist fetched metadata so later runs can skip the network."""
+    disk_cache_put("metadata", doi.lower(), orjson.dumps({'doi': doi, 'source': source, 'metadata': metadata}))
@@ -1,17 +1,26 @@
 """Configuration management."""
-import json
+import functools
 import os
+import orjson
 from pathlib import Path
+from typing import Optional, Tuple
 from models import Config
 
 
 CONFIG_PATH = Path(__file__).parent.parent / "library" / "config.json"
 LIBRARY_ROOT = Path(__file__).parent.parent / "library"
 
+# Cached (mtime, Config) for config.json; refreshed when the file changes
+_config_cache: Optional[Tuple[float, Config]] = None
+
 
 def load_config() -> Config:
     """Load configuration from config.json."""
-    if not CONFIG_PATH.exists():
+    global _config_cache
+
+    try:
+        mtime = CONFIG_PATH.stat().st_mtime
+    except FileNotFoundError:
         # Create default config
         default_config = Config(
             scihub_domain="sci-hub.se",
@@ -24,21 +33,35 @@ def load_config() -> Config:
         save_config(default_config)
         return default_config
 
-    with open(CONFIG_PATH, 'r') as f:
-        data = json.load(f)
-    return Config(**data)
+    if _config_cache is not None and _config_cache[0] == mtime:
+        return _config_cache[1]
+
+    with open(CONFIG_PATH, 'rb') as f:
+        data = orjson.loads(f.read())
+    config = Config(**data)
+    _config_cache = (mtime, config)
+    return config
 
 
 def save_config(config: Config) -> None:
     """Save configuration to config.json."""
+    global _config_cache
+
     CONFIG_PATH.parent.mkdir(parents=True, exist_ok=True)
-    with open(CONFIG_PATH, 'w') as f:
-        json.dump(config.model_dump(), f, indent=2)
+    with open(CONFIG_PATH, 'wb') as f:
+        f.write(orjson.dumps(config.model_dump(), option=orjson.OPT_INDENT_2))
+    _config_cache = (CONFIG_PATH.stat().st_mtime, config)
+
+
+@functools.lru_cache(maxsize=8)
+def _library_path(root: Path, relative: str) -> Path:
+    """Resolve a library path, creating its directory once per process."""
+    path = root / relative
+    path.mkdir(parents=True, exist_ok=True)
+    return path
 
 
 def get_library_path() -> Path:
     """Get the absolute path to the papers library."""
     config = load_config()
-    library_path = LIBRARY_ROOT / config.library_path
-    library_path.mkdir(parents=True, exist_ok=True)
-    return library_path
+    return _library_path(LIBRARY_ROOT, config.library_path)
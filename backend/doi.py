@@ -0,0 +1,34 @@
+"""Parsing of DOIs and preprint identifiers from user input."""
+import re
+import functools
+from typing import Optional
+
+
+# arXiv URL, bioRxiv URL or bare DOI, matched in a single pass over user input
+_INPUT_RE = re.compile(
+    r'(?P<arxiv>arxiv\.org/abs/(?P<axid>\d+\.\d+))'
+    r'|(?P<biorxiv>biorxiv\.org/content/(?P<brid>[^v\s]+))'
+    r'|(?P<doi>10\.\d{4,}/\S+)',
+    re.IGNORECASE
+)
+
+
+@functools.lru_cache(maxsize=256)
+def extract_doi_from_input(input_str: str) -> Optional[str]:
+    """Extract DOI from various input formats."""
+    input_str = input_str.strip()
+
+    match = _INPUT_RE.search(input_str)
+    if not match:
+        return None
+
+    kind = match.lastgroup
+    if kind == 'arxiv':
+        return f"arXiv:{match.group('axid')}"
+    if kind == 'biorxiv':
+        return f"bioRxiv:{match.group('brid')}"
+
+    # A direct DOI is returned as given; otherwise extract it from the URL
+    if match.start() == 0:
+        return input_str
+    return match.group('doi')
@@ -0,0 +1,65 @@
+"""Shared HTTP client for external requests."""
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+import httpx
+
+
+# Timeouts for external requests
+TIMEOUT = 30.0
+
+# Tighter per-call deadlines so one unhealthy source can't stall an import:
+# metadata APIs answer in well under a second when healthy, downloads and
+# scraped pages get a little longer between reads
+API_TIMEOUT = httpx.Timeout(connect=3.0, read=8.0, write=5.0, pool=10.0)
+DOWNLOAD_TIMEOUT = httpx.Timeout(connect=3.0, read=12.0, write=5.0, pool=10.0)
+
+# Upper bound on simultaneous outgoing requests across all imports
+MAX_CONCURRENT_REQUESTS = 64
+REQUEST_SEM = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+async def get_client() -> httpx.AsyncClient:
+    """Get the shared AsyncClient, creating it on first use."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            timeout=TIMEOUT,
+            follow_redirects=True,
+            http2=True,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=30),
+        )
+    return _client
+
+
+async def close_client() -> None:
+    """Close the shared AsyncClient (called on app shutdown)."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+async def get(url: str, **kwargs) -> httpx.Response:
+    """GET a URL through the shared client."""
+    client = await get_client()
+    async with REQUEST_SEM:
+        return await client.get(url, **kwargs)
+
+
+async def head(url: str, **kwargs) -> httpx.Response:
+    """HEAD a URL through the shared client."""
+    client = await get_client()
+    async with REQUEST_SEM:
+        return await client.head(url, **kwargs)
+
+
+@asynccontextmanager
+async def stream(method: str, url: str, **kwargs) -> AsyncIterator[httpx.Response]:
+    """Stream a response through the shared client."""
+    client = await get_client()
+    async with REQUEST_SEM:
+        async with client.stream(method, url, **kwargs) as response:
+            yield response
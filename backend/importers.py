@@ -1,164 +1,342 @@
 """DOI parsing, metadata fetch, and PDF download."""
 import re
-import httpx
-import fitz  # PyMuPDF
-from typing import Optional, Dict, Any, Tuple
-from pathlib import Path
+import asyncio
+import logging
+import orjson
+from selectolax.lexbor import LexborHTMLParser
+from typing import Optional, Dict, Any, Awaitable, Callable, Iterable, List, Tuple
+from urllib.parse import urljoin
 from models import Paper, Author
-from datetime import datetime
-from storage import generate_paper_id
+from storage import generate_paper_id, utc_now_iso
 from config import load_config
-
-
-# Timeouts for external requests
-TIMEOUT = 30.0
-
-
-def extract_doi_from_input(input_str: str) -> Optional[str]:
-    """Extract DOI from various input formats."""
-    input_str = input_str.strip()
-
-    # Direct DOI pattern
-    doi_pattern = r'10\.\d{4,}/[^\s]+'
-
-    # Check if it's a direct DOI
-    if re.match(r'^10\.\d{4,}/', input_str):
-        return input_str
-
-    # Extract from DOI URL
-    if 'doi.org' in input_str:
-        match = re.search(doi_pattern, input_str)
-        if match:
-            return match.group(0)
-
-    # arXiv URL
-    arxiv_match = re.search(r'arxiv\.org/abs/(\d+\.\d+)', input_str)
-    if arxiv_match:
-        return f"arXiv:{arxiv_match.group(1)}"
-
-    # bioRxiv URL
-    biorxiv_match = re.search(r'biorxiv\.org/content/([^v\s]+)', input_str)
-    if biorxiv_match:
-        return f"bioRxiv:{biorxiv_match.group(1)}"
-
-    # Try to extract DOI from any URL
-    match = re.search(doi_pattern, input_str)
-    if match:
-        return match.group(0)
-
-    return None
+from doi import extract_doi_from_input
+import http_client
+from ratelimit import get_with_retry, throttle
+from cache import (
+    PAGE_MISS_TTL, async_ttl_cache, async_single_flight, disk_cache_get, disk_cache_put, load_cached_metadata,
+    save_cached_metadata
+)
+
+logger = logging.getLogger(__name__)
+
+# Maximum number of candidate PDF URLs probed at once
+SCIHUB_PROBE_CONCURRENCY = 4
+
+# Read size when streaming PDF bodies
+PDF_CHUNK_SIZE = 65536
+
+# Comprehensive browser-like headers for PDF downloads, to avoid bot detection
+_BROWSER_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'application/pdf,application/octet-stream,*/*',
+    'Accept-Language': 'en-US,en;q=0.9',
+    'Accept-Encoding': 'gzip, deflate, br',
+    'DNT': '1',
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1',
+    'Sec-Fetch-Dest': 'document',
+    'Sec-Fetch-Mode': 'navigate',
+    'Sec-Fetch-Site': 'none',
+    'Cache-Control': 'max-age=0',
+}
+
+# Browser user agent for scraping publisher article pages
+_PAGE_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+# Worker counts for the metadata and PDF stages of batch imports
+BATCH_METADATA_WORKERS = 4
+BATCH_PDF_WORKERS = 8
+
+# Publisher page patterns for PDF links
+_JNEURO_PDF_RE = re.compile(r'href="(/content/jneuro/[^"]+\.full\.pdf)"')
+
+# OUP PDF links, most reliable first: article-pdf links, data-article-pdf
+# attributes, then any .pdf link mentioning article-pdf or download
+_OUP_PDF_PATTERNS = (
+    (re.compile(r'href="([^"]*article-pdf[^"]*\.pdf[^"]*)"'), "article-pdf link"),
+    (re.compile(r'data-article-pdf="([^"]+)"'), "data attr"),
+    (re.compile(r'href="((?=[^"]*\.pdf)(?=[^"]*(?:article-pdf|(?i:download)))[^"]+)"'), "general"),
+)
+
+# Identifier prefixes produced by extract_doi_from_input for preprints
+_ID_SCHEMES = {'arXiv': 'arxiv', 'bioRxiv': 'biorxiv'}
+
+# PLOS journal codes as they appear after the DOI prefix (10.1371/journal.pone...)
+_PLOS_JOURNALS = frozenset({
+    'journal.pone', 'journal.pcbi', 'journal.pgen', 'journal.ppat',
+    'journal.pbio', 'journal.pmed', 'journal.pntd',
+})
+
+# Elements through which Sci-Hub embeds or links the PDF
+_SCIHUB_PDF_SELECTOR = 'iframe[src], embed[src], object[data], a[href*=".pdf" i]'
+
+# Generic fallback for any absolute or relative URL ending in .pdf, matched
+# in a single pass so candidates come out in document order
+_ANY_PDF_RE = re.compile(
+    r'(?P<abs>(?:https?:)?//[^\s"\'<>]+\.pdf)'
+    r'|(?P<rel>/[^\s"\'<>]+\.pdf)',
+    re.IGNORECASE
+)
+
+
+def _scheme(doi: str) -> str:
+    """Classify an identifier as 'arxiv', 'biorxiv' or a regular 'doi'."""
+    prefix, sep, _ = doi.partition(':')
+    return _ID_SCHEMES.get(prefix, 'doi') if sep else 'doi'
 
 
 async def fetch_metadata_semantic_scholar(doi: str) -> Optional[Dict[str, Any]]:
     """Fetch metadata from Semantic Scholar API."""
     try:
-        # Handle arXiv DOIs
-        if doi.startswith('arXiv:'):
-            arxiv_id = doi.split(':')[1]
-            url = f"https://api.semanticscholar.org/v1/paper/arXiv:{arxiv_id}"
-        else:
-            url = f"https://api.semanticscholar.org/v1/paper/{doi}"
-
-        async with httpx.AsyncClient(timeout=TIMEOUT) as client:
-            response = await client.get(url)
-            if response.status_code == 200:
-                data = response.json()
-                return {
-                    'title': data.get('title', ''),
-                    'authors': [{'name': a.get('name', ''), 'affiliation': None} for a in data.get('authors', [])],
-                    'abstract': data.get('abstract', ''),
-                    'journal': data.get('venue', ''),
-                    'year': data.get('year'),
-                    'url': data.get('url', ''),
-                    'pdf_url': data.get('openAccessPdf', {}).get('url') if data.get('openAccessPdf') else None
-                }
+        # arXiv identifiers are passed through as-is (arXiv:<id>)
+        url = f"https://api.semanticscholar.org/v1/paper/{doi}"
+
+        response = await get_with_retry(url, timeout=http_client.API_TIMEOUT)
+        if response.status_code == 200:
+            data = orjson.loads(response.content)
+            return {
+                'title': data.get('title', ''),
+                'authors': [{'name': a.get('name', ''), 'affiliation': None} for a in data.get('authors', [])],
+                'abstract': data.get('abstract', ''),
+                'journal': data.get('venue', ''),
+                'year': data.get('year'),
+                'url': data.get('url', ''),
+                'pdf_url': data.get('openAccessPdf', {}).get('url') if data.get('openAccessPdf') else None
+            }
     except Exception as e:
-        print(f"Semantic Scholar error: {e}")
+        logger.warning("Semantic Scholar error: %s", e)
     return None
 
 
 async def fetch_metadata_crossref(doi: str) -> Optional[Dict[str, Any]]:
     """Fetch metadata from CrossRef API (fallback)."""
     try:
-        if doi.startswith('arXiv:') or doi.startswith('bioRxiv:'):
+        if _scheme(doi) != 'doi':
             return None
 
         url = f"https://api.crossref.org/works/{doi}"
-        async with httpx.AsyncClient(timeout=TIMEOUT) as client:
-            response = await client.get(url)
-            if response.status_code == 200:
-                data = response.json()['message']
-                authors = []
-                for author in data.get('author', []):
-                    name = f"{author.get('given', '')} {author.get('family', '')}".strip()
-                    authors.append({'name': name, 'affiliation': None})
-
-                return {
-                    'title': data.get('title', [''])[0] if data.get('title') else '',
-                    'authors': authors,
-                    'abstract': data.get('abstract', ''),
-                    'journal': data.get('container-title', [''])[0] if data.get('container-title') else '',
-                    'year': data.get('published-print', {}).get('date-parts', [[None]])[0][0] or
-                            data.get('published-online', {}).get('date-parts', [[None]])[0][0],
-                    'url': data.get('URL', ''),
-                    'pdf_url': None
-                }
+        response = await get_with_retry(url, timeout=http_client.API_TIMEOUT)
+        if response.status_code == 200:
+            data = orjson.loads(response.content)['message']
+            authors = []
+            for author in data.get('author', []):
+                name = f"{author.get('given', '')} {author.get('family', '')}".strip()
+                authors.append({'name': name, 'affiliation': None})
+
+            return {
+                'title': data.get('title', [''])[0] if data.get('title') else '',
+                'authors': authors,
+                'abstract': data.get('abstract', ''),
+                'journal': data.get('container-title', [''])[0] if data.get('container-title') else '',
+                'year': data.get('published-print', {}).get('date-parts', [[None]])[0][0] or
+                        data.get('published-online', {}).get('date-parts', [[None]])[0][0],
+                'url': data.get('URL', ''),
+                'pdf_url': None
+            }
     except Exception as e:
-        print(f"CrossRef error: {e}")
+        logger.warning("CrossRef error: %s", e)
     return None
 
 
+@async_ttl_cache(is_hit=lambda result: result[0] is not None)
 async def fetch_metadata(doi: str) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
-    """Fetch metadata from available sources."""
-    # Try Semantic Scholar first
-    metadata = await fetch_metadata_semantic_scholar(doi)
-    if metadata:
-        return metadata, 'semantic_scholar'
+    """Fetch metadata from available sources.
 
-    # Fallback to CrossRef
-    metadata = await fetch_metadata_crossref(doi)
+    Results are cached by DOI, in memory and on disk, so repeated imports
+    of the same paper skip the network.
+    """
+    cached = load_cached_metadata(doi)
+    if cached:
+        return cached
+
+    metadata, source = await _fetch_metadata_remote(doi)
     if metadata:
-        return metadata, 'crossref'
+        save_cached_metadata(doi, metadata, source)
+    return metadata, source
+
 
-    return None, None
+async def _fetch_metadata_remote(doi: str) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """Query metadata APIs.
+
+    Semantic Scholar and CrossRef are queried concurrently. Semantic Scholar
+    is preferred whenever it returns a result; CrossRef is used as fallback.
+    """
+    t_ss = asyncio.create_task(fetch_metadata_semantic_scholar(doi))
+
+    # CrossRef has no records for arXiv/bioRxiv identifiers
+    if _scheme(doi) != 'doi':
+        metadata = await t_ss
+        return (metadata, 'semantic_scholar') if metadata else (None, None)
+
+    t_cr = asyncio.create_task(fetch_metadata_crossref(doi))
+    try:
+        done, _ = await asyncio.wait({t_ss, t_cr}, return_when=asyncio.FIRST_COMPLETED)
+
+        if t_ss in done:
+            metadata = t_ss.result()
+            if metadata:
+                return metadata, 'semantic_scholar'
+            metadata = await t_cr
+            return (metadata, 'crossref') if metadata else (None, None)
+
+        # CrossRef finished first, but Semantic Scholar still takes precedence
+        metadata = await t_ss
+        if metadata:
+            return metadata, 'semantic_scholar'
+        metadata = t_cr.result()
+        return (metadata, 'crossref') if metadata else (None, None)
+    finally:
+        for task in (t_ss, t_cr):
+            if not task.done():
+                task.cancel()
 
 
 async def download_pdf_from_url(url: str, referer: Optional[str] = None) -> Optional[bytes]:
     """Download PDF from a direct URL."""
     try:
-        # Use comprehensive browser-like headers to avoid bot detection
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'application/pdf,application/octet-stream,*/*',
-            'Accept-Language': 'en-US,en;q=0.9',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'DNT': '1',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
-            'Sec-Fetch-Dest': 'document',
-            'Sec-Fetch-Mode': 'navigate',
-            'Sec-Fetch-Site': 'none',
-            'Cache-Control': 'max-age=0',
-        }
-        if referer:
-            headers['Referer'] = referer
-
-        async with httpx.AsyncClient(timeout=TIMEOUT, follow_redirects=True, headers=headers) as client:
-            response = await client.get(url)
+        headers = {**_BROWSER_HEADERS, 'Referer': referer} if referer else _BROWSER_HEADERS
+
+        await throttle(url)
+        # Stream so non-PDF responses are rejected from headers alone
+        async with http_client.stream("GET", url, headers=headers, timeout=http_client.DOWNLOAD_TIMEOUT) as response:
             if response.status_code == 200:
                 content_type = response.headers.get('content-type', '')
                 # Accept both application/pdf and application/octet-stream for PDFs
                 if content_type.startswith('application/pdf') or content_type.startswith('application/octet-stream'):
-                    # Verify it's actually a PDF by checking magic bytes
-                    if response.content.startswith(b'%PDF'):
-                        return response.content
+                    chunks = []
+                    head = b''
+                    async for chunk in response.aiter_bytes(PDF_CHUNK_SIZE):
+                        chunks.append(chunk)
+                        # Verify it's actually a PDF by checking magic bytes,
+                        # aborting before the rest of the body is downloaded
+                        if len(head) < 4:
+                            head += chunk[:4]
+                            if len(head) >= 4 and not head.startswith(b'%PDF'):
+                                return None
+                    if len(head) >= 4:
+                        return b''.join(chunks)
             elif response.status_code == 403:
-                print(f"Access forbidden (403) for {url} - likely bot protection")
+                logger.warning("Access forbidden (403) for %s - likely bot protection", url)
     except Exception as e:
-        print(f"PDF download error from {url}: {e}")
+        logger.warning("PDF download error from %s: %s", url, e)
     return None
 
 
+def _normalize_pdf_url(pdf_url: str, base_url: str) -> str:
+    """Resolve a protocol-relative or relative PDF link against the page URL."""
+    return urljoin(base_url, pdf_url.split('#', 1)[0])
+
+
+async def _fetch_page(
+    url: str,
+    has_candidate: Callable[[str, str], bool],
+    headers: Optional[Dict[str, str]] = None,
+) -> Optional[Tuple[str, str]]:
+    """
+    Fetch an HTML page, reusing a copy cached on disk when available.
+    Returns: (final_url, html) after redirects, or None if unavailable.
+    Pages where has_candidate(final_url, html) finds a PDF link are kept for
+    DISK_TTL; for the rest only the final URL is kept, and only for PAGE_MISS_TTL.
+    """
+    cached = disk_cache_get("pages", url)
+    if cached is None:
+        cached = disk_cache_get("page-misses", url, ttl=PAGE_MISS_TTL)
+    if cached is not None:
+        entry = orjson.loads(cached)
+        return entry['url'], entry['html']
+
+    response = await get_with_retry(url, headers=headers, timeout=http_client.DOWNLOAD_TIMEOUT)
+    if response.status_code != 200:
+        return None
+
+    page = (str(response.url), response.text)
+    if has_candidate(*page):
+        disk_cache_put("pages", url, orjson.dumps({'url': page[0], 'html': page[1]}))
+    else:
+        disk_cache_put("page-misses", url, orjson.dumps({'url': page[0], 'html': ''}))
+    return page
+
+
+async def _first_pdf(coros: List[Awaitable[Optional[bytes]]]) -> Optional[bytes]:
+    """Run PDF sources concurrently and return the first non-empty result.
+
+    Remaining sources are cancelled once one succeeds.
+    """
+    tasks = [asyncio.ensure_future(coro) for coro in coros]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            try:
+                pdf_content = await next_done
+            except Exception as e:
+                logger.warning("PDF source failed: %s", e)
+                continue
+            if pdf_content:
+                return pdf_content
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+    return None
+
+
+async def looks_like_pdf(url: str) -> bool:
+    """Cheaply check whether a URL serves a PDF without downloading the body."""
+    try:
+        await throttle(url)
+        response = await http_client.head(url, timeout=http_client.API_TIMEOUT)
+        if response.status_code == 200 and response.headers.get('content-type', '').startswith('application/pdf'):
+            return True
+        if response.status_code in (404, 410):
+            return False
+
+        # Some servers reject or misreport HEAD; peek at the first bytes instead
+        async with http_client.stream("GET", url, headers={'Range': 'bytes=0-7'}, timeout=http_client.API_TIMEOUT) as response:
+            if response.status_code not in (200, 206):
+                return False
+            head_bytes = b''
+            async for chunk in response.aiter_bytes():
+                head_bytes += chunk
+                if len(head_bytes) >= 5:
+                    break
+            return head_bytes.startswith(b'%PDF-')
+    except Exception as e:
+        logger.debug("PDF preflight failed for %s: %s", url, e)
+        return False
+
+
+async def download_first_pdf(
+    urls: Iterable[str],
+    max_concurrency: int = SCIHUB_PROBE_CONCURRENCY,
+    preflight: bool = False,
+) -> Optional[bytes]:
+    """Download candidate URLs concurrently and return the first valid PDF.
+
+    With preflight, each URL is checked with looks_like_pdf before the full
+    download, which pays off for low-confidence candidates.
+    """
+    # Drop duplicates while keeping the original order
+    urls = list(dict.fromkeys(urls))
+    if not urls:
+        return None
+    logger.debug("Trying %d candidate PDF URLs", len(urls))
+    sem = asyncio.Semaphore(max_concurrency)
+
+    async def try_one(url: str) -> Optional[bytes]:
+        async with sem:
+            if preflight and not await looks_like_pdf(url):
+                return None
+            return await download_pdf_from_url(url)
+
+    return await _first_pdf([try_one(url) for url in urls])
+
+
+def _scihub_has_candidate(page_url: str, html: str) -> bool:
+    """Cheap check for anything the Sci-Hub scraper could turn into a PDF URL."""
+    return '.pdf' in html.lower()
+
+
 async def fetch_pdf_scihub(doi: str) -> Optional[bytes]:
     """Fetch PDF from Sci-Hub."""
     try:
@@ -167,284 +345,198 @@ async def fetch_pdf_scihub(doi: str) -> Optional[bytes]:
 
         # Fetch the Sci-Hub page
         url = f"https://{scihub_domain}/{doi}"
-        async with httpx.AsyncClient(timeout=TIMEOUT, follow_redirects=True) as client:
-            response = await client.get(url)
-            if response.status_code == 200:
-                html = response.text
-
-                # Sci-Hub embeds PDFs in different ways. Try multiple patterns:
-
-                # Pattern 1: <object data="/storage/..." or <embed src="..."
-                object_match = re.search(r'<(?:object|embed)[^>]+(?:data|src)=["\']([^"\'#]+\.pdf)[^"\']*["\']', html, re.IGNORECASE)
-                if object_match:
-                    pdf_url = object_match.group(1)
-                    # Handle relative URLs
-                    if pdf_url.startswith('//'):
-                        pdf_url = f"https:{pdf_url}"
-                    elif pdf_url.startswith('/'):
-                        pdf_url = f"https://{scihub_domain}{pdf_url}"
-                    elif not pdf_url.startswith('http'):
-                        pdf_url = f"https://{scihub_domain}/{pdf_url}"
-
-                    print(f"Trying PDF URL from object/embed: {pdf_url}")
-                    pdf_content = await download_pdf_from_url(pdf_url)
-                    if pdf_content:
-                        return pdf_content
-
-                # Pattern 2: <iframe src="...pdf"
-                iframe_match = re.search(r'<iframe[^>]+src=["\']([^"\']+\.pdf[^"\']*)["\']', html, re.IGNORECASE)
-                if iframe_match:
-                    pdf_url = iframe_match.group(1)
-                    if pdf_url.startswith('//'):
-                        pdf_url = f"https:{pdf_url}"
-                    elif pdf_url.startswith('/'):
-                        pdf_url = f"https://{scihub_domain}{pdf_url}"
-                    elif not pdf_url.startswith('http'):
-                        pdf_url = f"https://{scihub_domain}/{pdf_url}"
-
-                    print(f"Trying PDF URL from iframe: {pdf_url}")
-                    pdf_content = await download_pdf_from_url(pdf_url)
-                    if pdf_content:
-                        return pdf_content
-
-                # Pattern 3: Download button/link href="/download/..." or href="/storage/..."
-                download_match = re.search(r'href=["\'](/(?:download|storage)/[^"\'#]+\.pdf)["\']', html, re.IGNORECASE)
-                if download_match:
-                    pdf_url = f"https://{scihub_domain}{download_match.group(1)}"
-                    print(f"Trying PDF URL from download link: {pdf_url}")
-                    pdf_content = await download_pdf_from_url(pdf_url)
-                    if pdf_content:
-                        return pdf_content
-
-                # Pattern 4: Try any relative URL ending in .pdf in the HTML
-                all_pdf_urls = re.findall(r'/[^\s"\'<>]+\.pdf', html, re.IGNORECASE)
-                for pdf_path in all_pdf_urls:
-                    pdf_url = f"https://{scihub_domain}{pdf_path}"
-                    print(f"Trying PDF URL from pattern search: {pdf_url}")
-                    pdf_content = await download_pdf_from_url(pdf_url)
-                    if pdf_content:
-                        return pdf_content
-
-                # Pattern 5: Try any absolute URL ending in .pdf
-                abs_pdf_urls = re.findall(r'(?:https?:)?//[^\s"\'<>]+\.pdf', html, re.IGNORECASE)
-                for pdf_url in abs_pdf_urls:
-                    if pdf_url.startswith('//'):
-                        pdf_url = f"https:{pdf_url}"
-                    print(f"Trying absolute PDF URL: {pdf_url}")
-                    pdf_content = await download_pdf_from_url(pdf_url)
-                    if pdf_content:
-                        return pdf_content
+        page = await _fetch_page(url, _scihub_has_candidate)
+        if page:
+            _, html = page
+            base_url = f"https://{scihub_domain}/"
+
+            # Sci-Hub embeds PDFs in different ways (object/embed, iframe,
+            # download link); collect them from the DOM in document order
+            structured = []
+            for node in LexborHTMLParser(html).css(_SCIHUB_PDF_SELECTOR):
+                attrs = node.attributes
+                pdf_url = attrs.get('src') or attrs.get('data') or attrs.get('href')
+                if pdf_url and '.pdf' in pdf_url.lower():
+                    structured.append(_normalize_pdf_url(pdf_url, base_url))
+
+            if structured:
+                logger.debug("Trying %d PDF URLs from object/embed/iframe/download links", len(structured))
+                pdf_content = await download_first_pdf(structured)
+                if pdf_content:
+                    return pdf_content
+
+            # No PDF elements in the DOM, or only stale ones (e.g. an old
+            # viewer iframe), so probe every other URL ending in .pdf
+            tried = set(structured)
+            candidates = (
+                url for url in (
+                    _normalize_pdf_url(match.group(), base_url)
+                    for match in _ANY_PDF_RE.finditer(html)
+                )
+                if url not in tried
+            )
+            pdf_content = await download_first_pdf(candidates, preflight=True)
+            if pdf_content:
+                return pdf_content
+
+    except Exception as e:
+        logger.warning("Sci-Hub error: %s", e)
+    return None
+
+
+async def _fetch_pdf_unpaywall(doi: str) -> Optional[bytes]:
+    """Fetch PDF via Unpaywall (aggregates open-access PDFs from many sources)."""
+    try:
+        unpaywall_url = f"https://api.unpaywall.org/v2/{doi}?email=user@localhost"
+        response = await get_with_retry(unpaywall_url, timeout=http_client.API_TIMEOUT)
+        if response.status_code == 200:
+            data = orjson.loads(response.content)
+            best_location = data.get('best_oa_location')
+            if best_location and best_location.get('url_for_pdf'):
+                pdf_url = best_location['url_for_pdf']
+                landing_page = best_location.get('url_for_landing_page', '')
+                logger.debug("Found Unpaywall PDF URL: %s", pdf_url)
+
+                # For OUP and other publishers, try with referer header
+                if 'oup.com' in pdf_url and landing_page:
+                    return await download_pdf_from_url(pdf_url, referer=landing_page)
+                return await download_pdf_from_url(pdf_url)
+    except Exception as e:
+        logger.warning("Unpaywall error: %s", e)
+    return None
 
+
+async def _fetch_pdf_jneurosci(doi: str) -> Optional[bytes]:
+    """Fetch PDF from JNeurosci, which requires scraping the page for the PDF link."""
+    try:
+        response = await get_with_retry(f"https://www.jneurosci.org/lookup/doi/{doi}", timeout=http_client.DOWNLOAD_TIMEOUT)
+        if response.status_code == 200:
+            # Extract PDF link from HTML
+            pdf_match = _JNEURO_PDF_RE.search(response.text)
+            if pdf_match:
+                return await download_pdf_from_url(f"https://www.jneurosci.org{pdf_match.group(1)}")
     except Exception as e:
-        print(f"Sci-Hub error: {e}")
+        logger.warning("JNeurosci page scraping error: %s", e)
     return None
 
 
+def _oup_has_candidate(page_url: str, html: str) -> bool:
+    """Check whether an article page is on OUP and links to a PDF."""
+    return 'academic.oup.com' in page_url and any(
+        pattern.search(html) for pattern, _ in _OUP_PDF_PATTERNS
+    )
+
+
+async def _fetch_pdf_oup(doi: str, metadata: Dict[str, Any]) -> Optional[bytes]:
+    """Fetch PDF from Oxford University Press (academic.oup.com) journals.
+
+    Scrapes the article page for the PDF link; works for any DOI that redirects to OUP.
+    """
+    publisher_urls: Dict[str, None] = {}
+    try:
+        # First, try to scrape the article page for the PDF link
+        article_url = metadata.get('url', '')
+        if not article_url:
+            article_url = f"https://doi.org/{doi}"
+
+        page = await _fetch_page(article_url, _oup_has_candidate, headers=_PAGE_HEADERS)
+        if page:
+            page_url, html = page
+
+            # Check if this is an OUP page
+            if 'academic.oup.com' in page_url:
+                logger.debug("Detected OUP article page: %s", page_url)
+
+                # Look for PDF download links in the page
+                for pattern, label in _OUP_PDF_PATTERNS:
+                    for match in pattern.finditer(html):
+                        pdf_url = _normalize_pdf_url(match.group(1), page_url)
+                        if pdf_url not in publisher_urls:
+                            publisher_urls[pdf_url] = None
+                            logger.debug("Found OUP PDF URL (%s): %s", label, pdf_url)
+    except Exception as e:
+        logger.warning("Publisher page scraping error: %s", e)
+
+    if publisher_urls:
+        return await download_first_pdf(publisher_urls)
+    return None
+
+
+@async_single_flight
 async def fetch_pdf(doi: str, metadata: Optional[Dict[str, Any]] = None) -> Optional[bytes]:
-    """Fetch PDF from available sources (waterfall approach)."""
+    """Fetch PDF from available sources.
+
+    Open-access and publisher sources are tried concurrently and the first
+    valid PDF wins; Sci-Hub is only used if all of them fail. Concurrent
+    calls for a DOI share one download, but PDFs are not cached, so a later
+    call (e.g. a refetch after a failed import) always tries the network.
+    """
+    scheme = _scheme(doi)
+    sources = []
+    # Direct PDF links, deduplicated in priority order
+    direct_urls: Dict[str, None] = {}
+
     # 1. Semantic Scholar openAccessPdf
     if metadata and metadata.get('pdf_url'):
-        pdf = await download_pdf_from_url(metadata['pdf_url'])
-        if pdf:
-            return pdf
+        direct_urls[metadata['pdf_url']] = None
 
     # 2. arXiv direct link
-    if doi.startswith('arXiv:'):
-        arxiv_id = doi.split(':')[1]
-        arxiv_pdf_url = f"https://arxiv.org/pdf/{arxiv_id}.pdf"
-        pdf = await download_pdf_from_url(arxiv_pdf_url)
-        if pdf:
-            return pdf
+    if scheme == 'arxiv':
+        _, _, arxiv_id = doi.partition(':')
+        direct_urls[f"https://arxiv.org/pdf/{arxiv_id}.pdf"] = None
 
     # 3. bioRxiv direct link
-    if doi.startswith('bioRxiv:'):
-        biorxiv_id = doi.split(':')[1]
-        biorxiv_pdf_url = f"https://www.biorxiv.org/content/{biorxiv_id}.full.pdf"
-        pdf = await download_pdf_from_url(biorxiv_pdf_url)
-        if pdf:
-            return pdf
-
-    # 4. Unpaywall (aggregates open-access PDFs from many sources)
-    if not doi.startswith('arXiv:') and not doi.startswith('bioRxiv:'):
-        try:
-            unpaywall_url = f"https://api.unpaywall.org/v2/{doi}?email=user@localhost"
-            async with httpx.AsyncClient(timeout=TIMEOUT) as client:
-                response = await client.get(unpaywall_url)
-                if response.status_code == 200:
-                    data = response.json()
-                    best_location = data.get('best_oa_location')
-                    if best_location and best_location.get('url_for_pdf'):
-                        pdf_url = best_location['url_for_pdf']
-                        landing_page = best_location.get('url_for_landing_page', '')
-                        print(f"Found Unpaywall PDF URL: {pdf_url}")
-
-                        # For OUP and other publishers, try with referer header
-                        if 'oup.com' in pdf_url and landing_page:
-                            pdf = await download_pdf_from_url(pdf_url, referer=landing_page)
-                        else:
-                            pdf = await download_pdf_from_url(pdf_url)
-
-                        if pdf:
-                            return pdf
-        except Exception as e:
-            print(f"Unpaywall error: {e}")
+    if scheme == 'biorxiv':
+        _, _, biorxiv_id = doi.partition(':')
+        direct_urls[f"https://www.biorxiv.org/content/{biorxiv_id}.full.pdf"] = None
 
-    # 5. Publisher-specific direct URLs
-    publisher_urls = []
+    # 4. Unpaywall
+    if scheme == 'doi':
+        sources.append(_fetch_pdf_unpaywall(doi))
 
+    # 5. Publisher-specific direct URLs
     # PLOS journals
-    if 'journal.pone' in doi or 'journal.pcbi' in doi or 'journal.pgen' in doi or 'journal.ppat' in doi or 'journal.pbio' in doi or 'journal.pmed' in doi or 'journal.pntd' in doi:
-        publisher_urls.append(f"https://journals.plos.org/plosone/article/file?id={doi}&type=printable")
+    if doi.partition('/')[2][:12] in _PLOS_JOURNALS:
+        direct_urls[f"https://journals.plos.org/plosone/article/file?id={doi}&type=printable"] = None
 
     # eLife - handle version suffixes
     if 'elife' in doi.lower():
         # Extract article number from DOI like 10.7554/eLife.99545.4 or 10.7554/eLife.99545
         doi_lower = doi.lower()
         article_id = doi_lower.split('elife.')[-1].split('.')[0]  # Get first part after 'elife.'
-        publisher_urls.append(f"https://cdn.elifesciences.org/articles/{article_id}/elife-{article_id}-v1.pdf")
+        direct_urls[f"https://cdn.elifesciences.org/articles/{article_id}/elife-{article_id}-v1.pdf"] = None
+
+    sources.extend(download_pdf_from_url(url) for url in direct_urls)
 
-    # JNeurosci - requires scraping the page for PDF link
+    # JNeurosci
     if 'jneurosci' in doi.lower():
-        try:
-            async with httpx.AsyncClient(timeout=TIMEOUT, follow_redirects=True) as client:
-                response = await client.get(f"https://www.jneurosci.org/lookup/doi/{doi}")
-                if response.status_code == 200:
-                    # Extract PDF link from HTML
-                    import re
-                    pdf_match = re.search(r'href="(/content/jneuro/[^"]+\.full\.pdf)"', response.text)
-                    if pdf_match:
-                        publisher_urls.append(f"https://www.jneurosci.org{pdf_match.group(1)}")
-        except Exception as e:
-            print(f"JNeurosci page scraping error: {e}")
-
-    # Oxford University Press (OUP) - academic.oup.com journals
-    # Try to scrape article page for PDF link (will work for any DOI that redirects to OUP)
+        sources.append(_fetch_pdf_jneurosci(doi))
+
+    # Oxford University Press (OUP)
     if metadata:
-        try:
-            # First, try to scrape the article page for the PDF link
-            article_url = metadata.get('url', '')
-            if not article_url:
-                article_url = f"https://doi.org/{doi}"
-
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            async with httpx.AsyncClient(timeout=TIMEOUT, follow_redirects=True, headers=headers) as client:
-                response = await client.get(article_url)
-                if response.status_code == 200:
-                    from urllib.parse import urljoin
-
-                    # Check if this is an OUP page
-                    if 'academic.oup.com' in str(response.url):
-                        print(f"Detected OUP article page: {response.url}")
-
-                        # Look for PDF download link in the page
-                        # Pattern 1: article-pdf link (most common for OUP)
-                        pdf_match = re.search(r'href="([^"]*article-pdf[^"]*\.pdf[^"]*)"', response.text)
-                        if pdf_match:
-                            pdf_url = pdf_match.group(1)
-                            if not pdf_url.startswith('http'):
-                                pdf_url = urljoin(str(response.url), pdf_url)
-                            publisher_urls.append(pdf_url)
-                            print(f"Found OUP PDF URL: {pdf_url}")
-
-                        # Pattern 2: Look for data-article-pdf attribute or similar
-                        pdf_data_match = re.search(r'data-article-pdf="([^"]+)"', response.text)
-                        if pdf_data_match:
-                            pdf_url = pdf_data_match.group(1)
-                            if not pdf_url.startswith('http'):
-                                pdf_url = urljoin(str(response.url), pdf_url)
-                            publisher_urls.append(pdf_url)
-                            print(f"Found OUP PDF URL (data attr): {pdf_url}")
-
-                        # Pattern 3: Look for PDF links in general
-                        all_pdf_links = re.findall(r'href="([^"]+\.pdf[^"]*)"', response.text)
-                        for link in all_pdf_links:
-                            if 'article-pdf' in link or 'download' in link.lower():
-                                pdf_url = link if link.startswith('http') else urljoin(str(response.url), link)
-                                if pdf_url not in publisher_urls:
-                                    publisher_urls.append(pdf_url)
-                                    print(f"Found OUP PDF URL (general): {pdf_url}")
-        except Exception as e:
-            print(f"Publisher page scraping error: {e}")
-
-    # Try publisher-specific URLs
-    for url in publisher_urls:
-        pdf = await download_pdf_from_url(url)
-        if pdf:
-            return pdf
+        sources.append(_fetch_pdf_oup(doi, metadata))
 
-    # 6. Sci-Hub (last resort)
-    pdf = await fetch_pdf_scihub(doi)
+    pdf = await _first_pdf(sources)
     if pdf:
         return pdf
 
-    return None
-
-
-def extract_doi_from_pdf(pdf_path: Path) -> Optional[str]:
-    """Extract DOI from first page of PDF."""
-    try:
-        doc = fitz.open(pdf_path)
-        if len(doc) == 0:
-            return None
-
-        # Get text from first page
-        first_page = doc[0]
-        text = first_page.get_text()
-
-        # Search for DOI pattern
-        doi_pattern = r'10\.\d{4,}/[^\s]+'
-        match = re.search(doi_pattern, text)
-        if match:
-            return match.group(0)
-    except Exception as e:
-        print(f"Error extracting DOI from PDF: {e}")
-    return None
-
-
-def extract_text_from_pdf(pdf_path: Path, max_chars: int = 500) -> Optional[str]:
-    """Extract text from first page of PDF."""
-    try:
-        doc = fitz.open(pdf_path)
-        if len(doc) == 0:
-            return None
-
-        first_page = doc[0]
-        text = first_page.get_text()
-        return text[:max_chars] if text else None
-    except Exception as e:
-        print(f"Error extracting text from PDF: {e}")
-    return None
-
+    # 6. Sci-Hub (last resort)
+    return await fetch_pdf_scihub(doi)
 
-def validate_pdf(pdf_content: bytes) -> bool:
-    """Check if PDF is valid and has content."""
-    try:
-        doc = fitz.open(stream=pdf_content, filetype="pdf")
-        return len(doc) > 0
-    except Exception:
-        return False
 
+def has_pdf_markers(pdf_content: bytes) -> bool:
+    """Cheap check for the %PDF- header and a trailing %%EOF marker."""
+    return pdf_content.startswith(b'%PDF-') and b'%%EOF' in pdf_content[-4096:]
 
-async def import_by_doi(doi: str) -> Tuple[Optional[Paper], Optional[bytes], str]:
-    """
-    Import paper by DOI.
-    Returns: (paper, pdf_content, status)
-    status: 'success', 'partial', 'error'
-    """
-    # Fetch metadata
-    metadata, source = await fetch_metadata(doi)
-    if not metadata:
-        return None, None, 'error'
 
-    # Create paper object
-    now = datetime.utcnow().isoformat() + 'Z'
+def _paper_from_metadata(doi: str, metadata: Dict[str, Any]) -> Paper:
+    """Create a new Paper from fetched metadata."""
+    now = utc_now_iso()
     paper_id = generate_paper_id(doi)
 
     authors = [Author(**a) for a in metadata.get('authors', [])]
 
-    paper = Paper(
+    return Paper(
         id=paper_id,
         doi=doi,
         title=metadata.get('title', 'Untitled'),
@@ -459,12 +551,85 @@ async def import_by_doi(doi: str) -> Tuple[Optional[Paper], Optional[bytes], str
         highlights=[]
     )
 
+
+async def _import_pdf_stage(doi: str, metadata: Dict[str, Any]) -> Tuple[Optional[Paper], Optional[bytes], str]:
+    """Build the paper and fetch its PDF once metadata is known."""
+    paper = _paper_from_metadata(doi, metadata)
+
     # Fetch PDF
     pdf_content = await fetch_pdf(doi, metadata)
 
-    if pdf_content and validate_pdf(pdf_content):
+    # Every PDF source has already checked the %PDF magic, so the markers are
+    # the fast path here; the document is parsed (and rejected if unreadable)
+    # once when it's saved, during text extraction
+    if pdf_content and has_pdf_markers(pdf_content):
         return paper, pdf_content, 'success'
-    elif paper:
-        return paper, None, 'partial'
-    else:
+    return paper, None, 'partial'
+
+
+async def import_by_doi(doi: str) -> Tuple[Optional[Paper], Optional[bytes], str]:
+    """
+    Import paper by DOI.
+    Returns: (paper, pdf_content, status)
+    status: 'success', 'partial', 'error'
+    """
+    # Fetch metadata
+    metadata, source = await fetch_metadata(doi)
+    if not metadata:
         return None, None, 'error'
+
+    return await _import_pdf_stage(doi, metadata)
+
+
+async def import_by_dois(
+    dois: List[str],
+    metadata_workers: int = BATCH_METADATA_WORKERS,
+    pdf_workers: int = BATCH_PDF_WORKERS,
+) -> List[Tuple[Optional[Paper], Optional[bytes], str]]:
+    """
+    Import several papers, pipelining metadata fetches and PDF downloads.
+    Returns one (paper, pdf_content, status) tuple per DOI, in input order.
+    """
+    results: List[Tuple[Optional[Paper], Optional[bytes], str]] = [(None, None, 'error')] * len(dois)
+    meta_q: asyncio.Queue = asyncio.Queue()
+    pdf_q: asyncio.Queue = asyncio.Queue(maxsize=pdf_workers * 2)
+
+    for index, doi in enumerate(dois):
+        meta_q.put_nowait((index, doi))
+
+    # A failure only marks its own DOI as an error; the batch carries on
+    async def metadata_worker():
+        while not meta_q.empty():
+            index, doi = meta_q.get_nowait()
+            try:
+                metadata, _ = await fetch_metadata(doi)
+            except Exception as e:
+                logger.warning("Metadata fetch failed for %s: %s", doi, e)
+                continue
+            if metadata:
+                await pdf_q.put((index, doi, metadata))
+
+    async def pdf_worker():
+        while True:
+            item = await pdf_q.get()
+            if item is None:
+                return
+            index, doi, metadata = item
+            try:
+                results[index] = await _import_pdf_stage(doi, metadata)
+            except Exception as e:
+                logger.warning("PDF import failed for %s: %s", doi, e)
+                results[index] = (_paper_from_metadata(doi, metadata), None, 'partial')
+
+    pdf_tasks = [asyncio.create_task(pdf_worker()) for _ in range(pdf_workers)]
+    try:
+        await asyncio.gather(*(metadata_worker() for _ in range(metadata_workers)))
+        for _ in pdf_tasks:
+            await pdf_q.put(None)
+        await asyncio.gather(*pdf_tasks)
+    finally:
+        for task in pdf_tasks:
+            if not task.done():
+                task.cancel()
+
+    return results
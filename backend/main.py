@@ -3,40 +3,47 @@ from fastapi import FastAPI, HTTPException
 from fastapi.responses import FileResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pathlib import Path
+import asyncio
 import uuid
-from datetime import datetime
-from typing import List
+from typing import List, Optional, Tuple
 
 from models import (
     Paper, PaperMetadata, ImportRequest, ImportResponse,
     PaperUpdate, TagUpdate, BulkTagRequest, BulkTagResponse,
+    BulkImportRequest, BulkImportResponse,
     HighlightCreate, HighlightUpdate, HighlightResponse, SearchResponse,
     Config as ConfigModel, Highlight, HighlightAnchor
 )
 from storage import (
-    load_paper, save_paper, delete_paper, list_papers, paper_exists,
+    load_paper, save_paper, save_papers, delete_paper, list_papers, paper_exists,
     find_paper_by_doi, save_pdf, get_pdf_path, add_highlight,
     update_highlight, delete_highlight, update_tags,
-    bulk_update_tags, generate_paper_id
+    bulk_update_tags, generate_paper_id, utc_now_iso, validate_and_extract_text,
+    save_extracted_text, delete_pdf, get_paper_path, close_extract_pool
 )
 from importers import (
-    extract_doi_from_input, import_by_doi, fetch_pdf
+    extract_doi_from_input, import_by_doi, import_by_dois, fetch_pdf, has_pdf_markers
 )
 from search import (
-    initialize_search_index, search_papers, add_paper_to_index, refresh_search_index
+    initialize_search_index, search_papers, add_paper_to_index, update_paper_field_in_index,
+    remove_paper_from_index
 )
 from config import load_config, save_config
+from http_client import close_client
 
 
 app = FastAPI(title="Scholarita API")
 
-# CORS middleware
+# CORS middleware; explicit methods and headers let preflight responses be
+# built once, and browsers cache them for a day
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["http://localhost:5173", "http://localhost:3000"],
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
+    # Range is sent by pdf.js when it loads PDFs in chunks
+    allow_headers=["Content-Type", "Range"],
+    max_age=86400,
 )
 
 
@@ -46,6 +53,13 @@ async def startup_event():
     initialize_search_index()
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Close the shared HTTP client and text extraction pool on shutdown."""
+    await close_client()
+    close_extract_pool()
+
+
 # Papers endpoints
 @app.get("/api/papers", response_model=List[PaperMetadata])
 async def get_papers():
@@ -62,11 +76,8 @@ async def get_paper(paper_id: str):
     return paper
 
 
-@app.post("/api/papers/import", response_model=ImportResponse)
-async def import_paper(request: ImportRequest):
-    """Import paper by URL or DOI."""
-    # Extract DOI
-    doi = extract_doi_from_input(request.input)
+def _check_importable(doi: Optional[str]) -> Optional[ImportResponse]:
+    """Get the error response for an input that can't be imported, if any."""
     if not doi:
         return ImportResponse(
             status="error",
@@ -84,48 +95,80 @@ async def import_paper(request: ImportRequest):
             message=f"Paper already in library: '{existing_paper.title if existing_paper else 'Unknown'}'",
             existing_id=existing_id
         )
+    return None
 
-    # Import paper
-    try:
-        paper, pdf_content, import_status = await import_by_doi(doi)
 
-        if not paper:
-            return ImportResponse(
-                status="error",
-                error="fetch_failed",
-                message="Could not fetch metadata. Check the DOI and try again."
-            )
+async def _store_pdf(paper_id: str, pdf_content: bytes) -> Tuple[bool, Optional[str]]:
+    """
+    Save a fetched PDF and its extracted text.
+    The file is parsed once, off the event loop; one that doesn't open or has
+    no pages is deleted again. Returns: (is_valid, text)
+    """
+    await asyncio.to_thread(save_pdf, paper_id, pdf_content)
+
+    is_valid, extracted_text = await asyncio.to_thread(validate_and_extract_text, paper_id)
+    if not is_valid:
+        await asyncio.to_thread(delete_pdf, paper_id)
+        return False, None
 
-        # Save paper
+    if extracted_text:
+        await asyncio.to_thread(save_extracted_text, paper_id, extracted_text)
+    return True, extracted_text
+
+
+async def _save_imported_paper(
+    paper: Optional[Paper], pdf_content: Optional[bytes], import_status: str, saved: bool = False
+) -> ImportResponse:
+    """Save an imported paper and its PDF, and index it.
+    With saved, the paper's JSON has already been written by the caller."""
+    if not paper:
+        return ImportResponse(
+            status="error",
+            error="fetch_failed",
+            message="Could not fetch metadata. Check the DOI and try again."
+        )
+
+    # Save paper
+    if not saved:
         save_paper(paper)
 
-        # Save PDF if available
-        if pdf_content:
-            save_pdf(paper.id, pdf_content)
+    # Save PDF if available; a PDF that turns out to be unreadable counts as missing
+    if pdf_content:
+        is_valid, _ = await _store_pdf(paper.id, pdf_content)
+        if not is_valid:
+            import_status = 'partial'
 
-            # Extract and save text from PDF
-            from storage import extract_text_from_pdf, save_extracted_text
-            extracted_text = extract_text_from_pdf(paper.id)
-            if extracted_text:
-                save_extracted_text(paper.id, extracted_text)
+    # Add to search index (will automatically load extracted text if available)
+    add_paper_to_index(paper)
+
+    if import_status == 'success':
+        return ImportResponse(
+            status="success",
+            paper_id=paper.id,
+            message="Paper imported successfully"
+        )
+    else:
+        return ImportResponse(
+            status="partial",
+            paper_id=paper.id,
+            message="Metadata imported, but PDF unavailable",
+            missing=["pdf"]
+        )
 
-        # Add to search index (will automatically load extracted text if available)
-        add_paper_to_index(paper)
 
-        if import_status == 'success':
-            return ImportResponse(
-                status="success",
-                paper_id=paper.id,
-                message="Paper imported successfully"
-            )
-        else:
-            return ImportResponse(
-                status="partial",
-                paper_id=paper.id,
-                message="Metadata imported, but PDF unavailable",
-                missing=["pdf"]
-            )
+@app.post("/api/papers/import", response_model=ImportResponse)
+async def import_paper(request: ImportRequest):
+    """Import paper by URL or DOI."""
+    # Extract DOI
+    doi = extract_doi_from_input(request.input)
+    rejected = _check_importable(doi)
+    if rejected:
+        return rejected
 
+    # Import paper
+    try:
+        paper, pdf_content, import_status = await import_by_doi(doi)
+        return await _save_imported_paper(paper, pdf_content, import_status)
     except Exception as e:
         return ImportResponse(
             status="error",
@@ -134,6 +177,54 @@ async def import_paper(request: ImportRequest):
         )
 
 
+@app.post("/api/papers/bulk-import", response_model=BulkImportResponse)
+async def bulk_import_papers(request: BulkImportRequest):
+    """Import several papers by URL or DOI, fetching them concurrently."""
+    responses: List[Optional[ImportResponse]] = [None] * len(request.inputs)
+    pending = {}  # doi -> indices of the inputs that resolve to it
+
+    for index, input_str in enumerate(request.inputs):
+        doi = extract_doi_from_input(input_str)
+        if doi and doi.lower() in pending:
+            pending[doi.lower()][1].append(index)
+            continue
+        responses[index] = _check_importable(doi)
+        if responses[index] is None:
+            pending[doi.lower()] = (doi, [index])
+
+    dois = [doi for doi, _ in pending.values()]
+    results = await import_by_dois(dois)
+
+    # Save the fetched papers' JSON as one durable batch
+    save_papers([paper for paper, _, _ in results if paper])
+
+    for (doi, indices), (paper, pdf_content, import_status) in zip(pending.values(), results):
+        try:
+            response = await _save_imported_paper(paper, pdf_content, import_status, saved=True)
+        except Exception as e:
+            response = ImportResponse(
+                status="error",
+                error="import_failed",
+                message=f"Import failed: {str(e)}"
+            )
+        responses[indices[0]] = response
+        # Later inputs for the same DOI are duplicates of the first
+        for index in indices[1:]:
+            responses[index] = ImportResponse(
+                status="error",
+                error="duplicate",
+                message=f"Duplicate of another input in this batch: {doi}",
+                existing_id=response.paper_id
+            )
+
+    imported = sum(1 for r in responses if r.status != "error")
+    return BulkImportResponse(
+        status="success",
+        imported_count=imported,
+        message=f"Imported {imported} of {len(responses)} papers",
+        results=responses
+    )
+
 
 @app.put("/api/papers/{paper_id}")
 async def update_paper(paper_id: str, update: PaperUpdate):
@@ -157,7 +248,9 @@ async def update_paper(paper_id: str, update: PaperUpdate):
         paper.url = update.url
 
     save_paper(paper)
-    add_paper_to_index(paper)
+    # Re-index only the edited metadata, so the full text isn't re-read here
+    for field in ('title', 'author', 'abstract'):
+        update_paper_field_in_index(paper, field)
 
     return {"status": "success", "paper_id": paper_id}
 
@@ -165,13 +258,12 @@ async def update_paper(paper_id: str, update: PaperUpdate):
 @app.put("/api/papers/{paper_id}/tags")
 async def update_paper_tags(paper_id: str, tag_update: TagUpdate):
     """Update paper tags."""
-    if not update_tags(paper_id, tag_update.tags):
+    paper = update_tags(paper_id, tag_update.tags)
+    if not paper:
         raise HTTPException(status_code=404, detail="Paper not found")
 
-    # Refresh search index
-    paper = load_paper(paper_id)
-    if paper:
-        add_paper_to_index(paper)
+    # Re-index only the tags
+    update_paper_field_in_index(paper, 'tag')
 
     return {"status": "success", "paper_id": paper_id}
 
@@ -179,13 +271,12 @@ async def update_paper_tags(paper_id: str, tag_update: TagUpdate):
 @app.post("/api/papers/bulk-tag", response_model=BulkTagResponse)
 async def bulk_tag_papers(request: BulkTagRequest):
     """Bulk update tags for multiple papers."""
-    updated_count = bulk_update_tags(request.paper_ids, request.add_tags, request.remove_tags)
+    updated = bulk_update_tags(request.paper_ids, request.add_tags, request.remove_tags)
+    updated_count = len(updated)
 
-    # Refresh search index for updated papers
-    for paper_id in request.paper_ids:
-        paper = load_paper(paper_id)
-        if paper:
-            add_paper_to_index(paper)
+    # Re-index only the tags of updated papers
+    for paper in updated:
+        update_paper_field_in_index(paper, 'tag')
 
     return BulkTagResponse(
         status="success",
@@ -200,8 +291,8 @@ async def delete_paper_endpoint(paper_id: str):
     if not delete_paper(paper_id):
         raise HTTPException(status_code=404, detail="Paper not found")
 
-    # Refresh search index
-    refresh_search_index()
+    # Drop it from the search index
+    remove_paper_from_index(paper_id)
 
     return {"status": "success", "message": "Paper deleted"}
 
@@ -209,11 +300,19 @@ async def delete_paper_endpoint(paper_id: str):
 @app.get("/api/papers/{paper_id}/pdf")
 async def get_paper_pdf(paper_id: str):
     """Serve the PDF file."""
-    pdf_path = get_pdf_path(paper_id)
-    if not pdf_path:
+    _, pdf_path, _ = get_paper_path(paper_id)
+    # A single stat both checks existence and feeds the response headers
+    try:
+        stat_result = pdf_path.stat()
+    except FileNotFoundError:
         raise HTTPException(status_code=404, detail="PDF not found")
 
-    return FileResponse(pdf_path, media_type="application/pdf")
+    return FileResponse(
+        pdf_path,
+        media_type="application/pdf",
+        stat_result=stat_result,
+        headers={"Cache-Control": "private, max-age=3600"}
+    )
 
 
 @app.post("/api/papers/{paper_id}/refetch-pdf")
@@ -232,19 +331,22 @@ async def refetch_paper_pdf(paper_id: str):
         raise HTTPException(status_code=400, detail="Paper has no DOI")
 
     pdf_content = await fetch_pdf(paper.doi)
-    if pdf_content and validate_pdf(pdf_content):
-        save_pdf(paper_id, pdf_content)
-        return {"status": "success", "message": "PDF fetched successfully"}
-    else:
-        return {"status": "error", "message": "Could not fetch PDF"}
+    if pdf_content and has_pdf_markers(pdf_content):
+        is_valid, extracted_text = await _store_pdf(paper_id, pdf_content)
+        if is_valid:
+            if extracted_text:
+                update_paper_field_in_index(paper, 'fulltext')
+            return {"status": "success", "message": "PDF fetched successfully"}
+
+    return {"status": "error", "message": "Could not fetch PDF"}
 
 
 # Highlights endpoints
 @app.post("/api/papers/{paper_id}/highlights", response_model=HighlightResponse)
 async def create_highlight(paper_id: str, highlight_data: HighlightCreate):
     """Add a highlight to a paper."""
-    paper = load_paper(paper_id)
-    if not paper:
+    # add_highlight loads the paper itself, so only check that it exists here
+    if not paper_exists(paper_id):
         raise HTTPException(status_code=404, detail="Paper not found")
 
     # Validate same-page constraint
@@ -271,7 +373,7 @@ async def create_highlight(paper_id: str, highlight_data: HighlightCreate):
 
     # Create highlight
     highlight_id = f"h_{uuid.uuid4().hex[:12]}"
-    now = datetime.utcnow().isoformat() + 'Z'
+    now = utc_now_iso()
 
     highlight = Highlight(
         id=highlight_id,
@@ -283,11 +385,10 @@ async def create_highlight(paper_id: str, highlight_data: HighlightCreate):
         created_at=now
     )
 
-    if add_highlight(paper_id, highlight):
-        # Update search index
-        paper = load_paper(paper_id)
-        if paper:
-            add_paper_to_index(paper)
+    paper = add_highlight(paper_id, highlight)
+    if paper:
+        # Re-index only the highlights
+        update_paper_field_in_index(paper, 'highlight')
 
         return HighlightResponse(
             status="success",
@@ -304,13 +405,12 @@ async def create_highlight(paper_id: str, highlight_data: HighlightCreate):
 @app.put("/api/papers/{paper_id}/highlights/{highlight_id}")
 async def update_highlight_endpoint(paper_id: str, highlight_id: str, update_data: HighlightUpdate):
     """Update a highlight."""
-    if not update_highlight(paper_id, highlight_id, update_data.comment, update_data.color, update_data.text, update_data.anchor):
+    paper = update_highlight(paper_id, highlight_id, update_data.comment, update_data.color, update_data.text, update_data.anchor)
+    if not paper:
         raise HTTPException(status_code=404, detail="Highlight not found")
 
-    # Update search index
-    paper = load_paper(paper_id)
-    if paper:
-        add_paper_to_index(paper)
+    # Re-index only the highlights
+    update_paper_field_in_index(paper, 'highlight')
 
     return {"status": "success", "highlight_id": highlight_id}
 
@@ -318,13 +418,12 @@ async def update_highlight_endpoint(paper_id: str, highlight_id: str, update_dat
 @app.delete("/api/papers/{paper_id}/highlights/{highlight_id}")
 async def delete_highlight_endpoint(paper_id: str, highlight_id: str):
     """Delete a highlight."""
-    if not delete_highlight(paper_id, highlight_id):
+    paper = delete_highlight(paper_id, highlight_id)
+    if not paper:
         raise HTTPException(status_code=404, detail="Highlight not found")
 
-    # Update search index
-    paper = load_paper(paper_id)
-    if paper:
-        add_paper_to_index(paper)
+    # Re-index only the highlights
+    update_paper_field_in_index(paper, 'highlight')
 
     return {"status": "success", "message": "Highlight deleted"}
 
@@ -356,5 +455,13 @@ async def update_config(config: ConfigModel):
 
 
 if __name__ == "__main__":
+    import sys
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # uvloop and httptools replace the pure-Python event loop and HTTP parser;
+    # uvloop isn't available on Windows. A single worker is kept since the
+    # search index and metadata cache live in this process.
+    uvicorn.run(
+        app, host="0.0.0.0", port=8000,
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
+    )
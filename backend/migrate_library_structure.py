@@ -23,10 +23,41 @@ library/papers/
 """
 
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
+from typing import Iterable, Iterator, Optional, Tuple
 from config import get_library_path
 from storage import extract_text_from_pdf, save_extracted_text
 
+def extract_texts(paper_ids: Iterable[str]) -> Iterator[Tuple[str, Optional[str], Optional[Exception]]]:
+    """
+    Extract text from each paper's PDF across processes.
+    Yields: (paper_id, text, error)
+
+    A worker that dies (e.g. PyMuPDF crashing on a bad PDF) breaks the whole
+    pool, failing every paper still in it; those are retried one pool each,
+    so only the PDF that crashed is reported as failed.
+    """
+    retry = []
+    with ProcessPoolExecutor() as pool:
+        futures = [(paper_id, pool.submit(extract_text_from_pdf, paper_id)) for paper_id in paper_ids]
+        for paper_id, future in futures:
+            try:
+                yield paper_id, future.result(), None
+            except BrokenProcessPool:
+                retry.append(paper_id)
+            except Exception as e:
+                yield paper_id, None, e
+
+    for paper_id in retry:
+        with ProcessPoolExecutor(max_workers=1) as pool:
+            try:
+                yield paper_id, pool.submit(extract_text_from_pdf, paper_id).result(), None
+            except Exception as e:
+                yield paper_id, None, e
+
+
 def migrate_library():
     """Migrate library from old flat structure to new organized structure."""
     library_path = get_library_path()
@@ -54,7 +85,9 @@ def migrate_library():
 
     migrated_count = 0
     extracted_count = 0
+    to_extract = []
 
+    # Phase 1: move files into the new structure
     for json_file in json_files:
         paper_id = json_file.stem
         pdf_file = library_path / f"{paper_id}.pdf"
@@ -75,18 +108,7 @@ def migrate_library():
             if not new_pdf_path.exists():
                 pdf_file.rename(new_pdf_path)
                 print(f"  ✓ Moved PDF to pdfs/")
-
-                # Extract text
-                try:
-                    extracted_text = extract_text_from_pdf(paper_id)
-                    if extracted_text:
-                        save_extracted_text(paper_id, extracted_text)
-                        print(f"  ✓ Extracted text ({len(extracted_text)} chars)")
-                        extracted_count += 1
-                    else:
-                        print(f"  ⚠ Could not extract text from PDF")
-                except Exception as e:
-                    print(f"  ⚠ Error extracting text: {e}")
+                to_extract.append(paper_id)
             else:
                 print(f"  ⚠ PDF already exists in pdfs/, skipping")
         else:
@@ -95,6 +117,23 @@ def migrate_library():
         migrated_count += 1
         print()
 
+    # Phase 2: extract text from the moved PDFs, CPU-bound so spread across processes
+    if to_extract:
+        print(f"Extracting text from {len(to_extract)} PDFs\n")
+        for paper_id, extracted_text, error in extract_texts(to_extract):
+            if error:
+                print(f"  ⚠ {paper_id}: error extracting text: {error}")
+            elif extracted_text:
+                try:
+                    save_extracted_text(paper_id, extracted_text)
+                    print(f"  ✓ {paper_id}: extracted text ({len(extracted_text)} chars)")
+                    extracted_count += 1
+                except Exception as e:
+                    print(f"  ⚠ {paper_id}: error saving text: {e}")
+            else:
+                print(f"  ⚠ {paper_id}: could not extract text from PDF")
+        print()
+
     print("=" * 60)
     print(f"Migration complete!")
     print(f"Papers migrated: {migrated_count}")
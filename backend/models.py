@@ -67,6 +67,17 @@ class ImportResponse(BaseModel):
     error: Optional[str] = None
 
 
+class BulkImportRequest(BaseModel):
+    inputs: List[str]  # URLs or DOIs
+
+
+class BulkImportResponse(BaseModel):
+    status: str
+    imported_count: int
+    message: str
+    results: List[ImportResponse]
+
+
 class PaperUpdate(BaseModel):
     title: Optional[str] = None
     authors: Optional[List[Author]] = None
@@ -0,0 +1,87 @@
+"""Per-host rate limiting and retry for external APIs."""
+import asyncio
+import time
+from typing import Optional
+import httpx
+import http_client
+
+
+# Retry on rate limiting / temporary unavailability
+RETRY_STATUSES = {429, 503}
+MAX_ATTEMPTS = 3
+MAX_BACKOFF = 30.0
+
+
+class AsyncTokenBucket:
+    """Token bucket allowing `rate` requests per second with bursts of `burst`."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+
+    async def acquire(self) -> None:
+        """Wait until a request may be sent."""
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+        # Reserve a token up front; a negative balance queues later callers
+        self._tokens -= 1
+        if self._tokens < 0:
+            await asyncio.sleep(-self._tokens / self.rate)
+
+
+# Unauthenticated Semantic Scholar allows ~1 rps; CrossRef throttles bursts
+_BUCKETS = {
+    'api.semanticscholar.org': AsyncTokenBucket(rate=1, burst=1),
+    'api.crossref.org': AsyncTokenBucket(rate=5, burst=5),
+}
+_SCIHUB_BUCKET = AsyncTokenBucket(rate=2, burst=2)
+
+
+def get_bucket(url: str) -> Optional[AsyncTokenBucket]:
+    """Get the rate limiter for a URL's host, if it has one."""
+    host = httpx.URL(url).host
+    if 'sci-hub' in host:
+        return _SCIHUB_BUCKET
+    return _BUCKETS.get(host)
+
+
+async def throttle(url: str) -> None:
+    """Wait for the host's rate limiter before sending a request."""
+    bucket = get_bucket(url)
+    if bucket:
+        await bucket.acquire()
+
+
+def _retry_delay(response: Optional[httpx.Response], attempt: int) -> float:
+    """Get the delay before the next attempt, honouring Retry-After."""
+    fallback = min(2 ** attempt, MAX_BACKOFF)
+    if response is None:
+        return fallback
+    try:
+        return min(float(response.headers.get('retry-after', fallback)), MAX_BACKOFF)
+    except ValueError:
+        # Retry-After given as an HTTP date
+        return fallback
+
+
+async def get_with_retry(url: str, **kwargs) -> httpx.Response:
+    """GET a URL with rate limiting, retrying on 429/503 and read timeouts."""
+    for attempt in range(MAX_ATTEMPTS):
+        await throttle(url)
+        try:
+            response = await http_client.get(url, **kwargs)
+        except httpx.ReadTimeout:
+            if attempt == MAX_ATTEMPTS - 1:
+                raise
+            await asyncio.sleep(_retry_delay(None, attempt))
+            continue
+
+        if response.status_code not in RETRY_STATUSES or attempt == MAX_ATTEMPTS - 1:
+            return response
+        await asyncio.sleep(_retry_delay(response, attempt))
+
+    return response
@@ -1,108 +1,197 @@
 """In-memory search index for papers."""
 import re
+import functools
 from collections import defaultdict
-from typing import List, Dict, Set
-from models import Paper, SearchResult, SearchMatch
-from storage import list_papers, load_paper, get_or_extract_text
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+from models import Paper, Highlight, SearchResult, SearchMatch
+from storage import load_all_papers, get_or_extract_text, find_paper_by_doi
+from doi import extract_doi_from_input
 
 
+# Word pattern used for tokenizing documents and queries
+_TOKEN_RE = re.compile(r'\w+')
+
 # Common English stopwords
-STOPWORDS = {
+STOPWORDS = frozenset({
     'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from',
     'has', 'he', 'in', 'is', 'it', 'its', 'of', 'on', 'that', 'the',
     'to', 'was', 'will', 'with', 'this', 'but', 'they', 'have', 'had',
     'what', 'when', 'where', 'who', 'which', 'why', 'how'
+})
+
+
+@functools.lru_cache(maxsize=256)
+def _mark_pattern(tokens: Tuple[str, ...]) -> re.Pattern:
+    """Get a case-insensitive pattern matching any of the query tokens.
+
+    Longer tokens come first so overlapping tokens mark the longest match.
+    """
+    alternatives = sorted(set(tokens), key=len, reverse=True)
+    return re.compile('|'.join(map(re.escape, alternatives)), re.IGNORECASE)
+
+
+# Score contributed by each occurrence of a token in a field
+FIELD_WEIGHTS = {
+    'title': 10,
+    'tag': 8,
+    'author': 7,
+    'highlight': 6,
+    'abstract': 4,
+    'fulltext': 2,
 }
 
 
+# Order in which fields are indexed and their matches reported
+FIELD_ORDER = list(FIELD_WEIGHTS)
+
+# Score given to a paper looked up directly by its DOI or ID
+EXACT_MATCH_SCORE = 100.0
+
+
 class SearchIndex:
     def __init__(self):
         self.papers: Dict[str, Paper] = {}
-        self.index: Dict[str, List[tuple]] = defaultdict(list)
+        # token -> paper_id -> summed weight of the fields it occurs in
+        self.postings: Dict[str, Dict[str, int]] = defaultdict(dict)
+        # token -> paper_id -> fields it occurs in, in FIELD_ORDER
+        self.fields: Dict[str, Dict[str, List[str]]] = defaultdict(dict)
+        # (paper_id, token) -> (page, text) of each matching highlight
+        self.highlight_hits: Dict[Tuple[str, str], List[Tuple[int, str]]] = defaultdict(list)
+        # paper_id -> field -> tokens it contributed, so a single field
+        # or a whole paper can be removed without a rebuild
+        self.field_tokens: Dict[str, Dict[str, Set[str]]] = {}
 
     def tokenize(self, text: str) -> List[str]:
         """Tokenize text into searchable words."""
         if not text:
             return []
         # Lowercase, split on non-alphanumeric, remove stopwords
-        words = re.findall(r'\w+', text.lower())
-        return [word for word in words if word not in STOPWORDS and len(word) > 1]
+        return [word for word in _TOKEN_RE.findall(text.lower()) if len(word) > 1 and word not in STOPWORDS]
+
+    def _field_texts(self, paper: Paper, field: str) -> Iterator[Tuple[str, Optional[Highlight]]]:
+        """Yield the texts indexed for a field, with the highlight they come from."""
+        if field == 'title':
+            yield paper.title, None
+        elif field == 'tag':
+            for tag in paper.tags:
+                yield tag, None
+        elif field == 'author':
+            for author in paper.authors:
+                yield author.name, None
+        elif field == 'highlight':
+            for hl in paper.highlights:
+                yield hl.text + ' ' + (hl.comment or ''), hl
+        elif field == 'abstract':
+            if paper.abstract:
+                yield paper.abstract, None
+        elif field == 'fulltext':
+            # Full PDF text
+            pdf_text = get_or_extract_text(paper.id)
+            if pdf_text:
+                yield pdf_text, None
+
+    def _add_field(self, paper: Paper, field: str):
+        """Index one field of a paper.
+
+        Each token counts once per field, however often it repeats, so long
+        abstracts and full texts don't outscore a title match.
+        """
+        paper_id = paper.id
+        tokens: Set[str] = set()
+        for text, hl in self._field_texts(paper, field):
+            text_tokens = self.tokenize(text)
+            if hl is not None:
+                # One hit per highlight, in order of first occurrence
+                for token in dict.fromkeys(text_tokens):
+                    self.highlight_hits[(paper_id, token)].append((hl.page, hl.text))
+            tokens.update(text_tokens)
+
+        weight = FIELD_WEIGHTS[field]
+        for token in tokens:
+            postings = self.postings[token]
+            postings[paper_id] = postings.get(paper_id, 0) + weight
+            fields = self.fields[token].setdefault(paper_id, [])
+            fields.append(field)
+            if len(fields) > 1:
+                fields.sort(key=FIELD_ORDER.index)
+        self.field_tokens.setdefault(paper_id, {})[field] = tokens
+
+    def _remove_field(self, paper_id: str, field: str):
+        """Remove one field of a paper from the index."""
+        tokens = self.field_tokens.get(paper_id, {}).pop(field, None)
+        if not tokens:
+            return
+
+        weight = FIELD_WEIGHTS[field]
+        for token in tokens:
+            postings = self.postings[token]
+            fields = self.fields[token][paper_id]
+            fields.remove(field)
+            if field == 'highlight':
+                self.highlight_hits.pop((paper_id, token), None)
+            if fields:
+                postings[paper_id] -= weight
+                continue
+
+            del postings[paper_id]
+            del self.fields[token][paper_id]
+            if not postings:
+                del self.postings[token]
+                del self.fields[token]
 
     def add_paper(self, paper: Paper):
-        """Add a paper to the search index."""
+        """Add a paper to the search index, replacing any previous entries."""
+        self.remove_paper(paper.id)
+        self.papers[paper.id] = paper
+        for field in FIELD_ORDER:
+            self._add_field(paper, field)
+
+    def update_field(self, paper: Paper, field: str):
+        """Re-index a single field of a paper after it changed."""
+        if paper.id not in self.papers:
+            self.add_paper(paper)
+            return
         self.papers[paper.id] = paper
+        self._remove_field(paper.id, field)
+        self._add_field(paper, field)
 
-        # Index title (weight: 10)
-        for token in self.tokenize(paper.title):
-            self.index[token].append((paper.id, 'title', 10))
-
-        # Index tags (weight: 8)
-        for tag in paper.tags:
-            for token in self.tokenize(tag):
-                self.index[token].append((paper.id, 'tag', 8))
-
-        # Index authors (weight: 7)
-        for author in paper.authors:
-            for token in self.tokenize(author.name):
-                self.index[token].append((paper.id, 'author', 7))
-
-        # Index highlights (weight: 6)
-        for hl in paper.highlights:
-            highlight_text = hl.text + ' ' + (hl.comment or '')
-            for token in self.tokenize(highlight_text):
-                self.index[token].append((paper.id, 'highlight', 6, hl.page, hl.text))
-
-        # Index abstract (weight: 4)
-        if paper.abstract:
-            for token in self.tokenize(paper.abstract):
-                self.index[token].append((paper.id, 'abstract', 4))
-
-        # Index full PDF text (weight: 2)
-        pdf_text = get_or_extract_text(paper.id)
-        if pdf_text:
-            for token in self.tokenize(pdf_text):
-                self.index[token].append((paper.id, 'fulltext', 2))
+    def remove_paper(self, paper_id: str):
+        """Remove a paper's entries from the search index."""
+        self.papers.pop(paper_id, None)
+        for field in list(self.field_tokens.get(paper_id, ())):
+            self._remove_field(paper_id, field)
+        self.field_tokens.pop(paper_id, None)
 
     def rebuild(self):
         """Rebuild the entire search index."""
-        self.index.clear()
+        self.postings.clear()
+        self.fields.clear()
+        self.highlight_hits.clear()
         self.papers.clear()
+        self.field_tokens.clear()
 
-        # Load all papers
-        for paper_metadata in list_papers():
-            paper = load_paper(paper_metadata.id)
-            if paper:
-                self.add_paper(paper)
+        # Load all papers, rescanning the library on disk
+        for paper in load_all_papers():
+            self.add_paper(paper)
 
     def search(self, query: str, limit: int = 50) -> List[SearchResult]:
         """Search for papers matching the query."""
-        tokens = self.tokenize(query)
+        # Repeated query words count once
+        tokens = list(dict.fromkeys(self.tokenize(query)))
         if not tokens:
             return []
 
         # Calculate scores
         scores: Dict[str, float] = defaultdict(float)
-        matches_by_paper: Dict[str, List[Dict]] = defaultdict(list)
-
         for token in tokens:
-            for entry in self.index.get(token, []):
-                paper_id = entry[0]
-                field = entry[1]
-                weight = entry[2]
+            for paper_id, weight in self.postings.get(token, {}).items():
                 scores[paper_id] += weight
 
-                # Store match info
-                match_info = {'field': field, 'token': token}
-                if field == 'highlight' and len(entry) > 3:
-                    match_info['page'] = entry[3]
-                    match_info['text'] = entry[4]
-
-                matches_by_paper[paper_id].append(match_info)
-
         # Sort by score
         sorted_papers = sorted(scores.items(), key=lambda x: x[1], reverse=True)[:limit]
 
-        # Build results
+        # Build results, marking snippets with one pattern built for the whole query
+        pattern = _mark_pattern(tuple(tokens))
         results = []
         for paper_id, score in sorted_papers:
             paper = self.papers.get(paper_id)
@@ -111,23 +200,14 @@ class SearchIndex:
 
             # Generate match snippets
             matches = []
-            seen_fields = set()
-
-            for match_info in matches_by_paper[paper_id]:
-                field = match_info['field']
-                if field in seen_fields and field != 'highlight':
-                    continue
-
-                snippet = self._generate_snippet(paper, match_info, query)
+            for match_info in self._match_infos(paper_id, tokens):
+                snippet = self._generate_snippet(paper, match_info, pattern)
                 if snippet:
-                    match = SearchMatch(
-                        field=field,
+                    matches.append(SearchMatch(
+                        field=match_info['field'],
                         snippet=snippet,
                         page=match_info.get('page')
-                    )
-                    matches.append(match)
-                    if field != 'highlight':
-                        seen_fields.add(field)
+                    ))
 
             results.append(SearchResult(
                 paper_id=paper.id,
@@ -138,36 +218,74 @@ class SearchIndex:
 
         return results
 
-    def _generate_snippet(self, paper: Paper, match_info: Dict, query: str) -> str:
+    def lookup(self, query: str) -> Optional[Paper]:
+        """Find the paper a query names outright by its ID or DOI, if any."""
+        query = query.strip()
+        if not query or any(c.isspace() for c in query):
+            return None
+
+        paper = self.papers.get(query)
+        if paper:
+            return paper
+
+        doi = extract_doi_from_input(query)
+        paper_id = find_paper_by_doi(doi) if doi else None
+        return self.papers.get(paper_id) if paper_id else None
+
+    def _match_infos(self, paper_id: str, tokens: List[str]) -> Iterator[Dict]:
+        """Yield match info for the fields a paper matched, in FIELD_ORDER.
+
+        Each field is reported once, for the first query token that matched
+        it, except highlights, which are reported for every matching one.
+        """
+        first_token: Dict[str, str] = {}
+        highlights = []
+        for token in tokens:
+            for field in self.fields.get(token, {}).get(paper_id, ()):
+                if field == 'highlight':
+                    highlights.extend(
+                        {'field': field, 'token': token, 'page': page, 'text': text}
+                        for page, text in self.highlight_hits[(paper_id, token)]
+                    )
+                else:
+                    first_token.setdefault(field, token)
+
+        for field in FIELD_ORDER:
+            if field == 'highlight':
+                yield from highlights
+            elif field in first_token:
+                yield {'field': field, 'token': first_token[field]}
+
+    def _generate_snippet(self, paper: Paper, match_info: Dict, pattern: re.Pattern) -> str:
         """Generate a highlighted snippet for a match."""
         field = match_info['field']
         token = match_info['token']
 
         if field == 'title':
-            return self._highlight_text(paper.title, query)
+            return self._highlight_text(paper.title, pattern)
         elif field == 'tag':
             # Find matching tag
             for tag in paper.tags:
                 if token in tag.lower():
-                    return self._highlight_text(tag, query)
+                    return self._highlight_text(tag, pattern)
         elif field == 'highlight':
             text = match_info.get('text', '')
-            return self._highlight_text(text[:200], query)
+            return self._highlight_text(text[:200], pattern)
         elif field == 'abstract':
             # Find context around match
             abstract = paper.abstract or ''
             snippet = self._extract_context(abstract, token)
-            return self._highlight_text(snippet, query)
+            return self._highlight_text(snippet, pattern)
         elif field == 'author':
             for author in paper.authors:
                 if token in author.name.lower():
-                    return self._highlight_text(author.name, query)
+                    return self._highlight_text(author.name, pattern)
         elif field == 'fulltext':
             # Extract context from full text
             pdf_text = get_or_extract_text(paper.id)
             if pdf_text:
                 snippet = self._extract_context(pdf_text, token)
-                return self._highlight_text(snippet, query)
+                return self._highlight_text(snippet, pattern)
 
         return ''
 
@@ -189,17 +307,20 @@ class SearchIndex:
 
         return snippet
 
-    def _highlight_text(self, text: str, query: str) -> str:
-        """Add <mark> tags around matching words."""
-        tokens = self.tokenize(query)
-        result = text
-
-        for token in tokens:
-            # Case-insensitive replacement with <mark> tags
-            pattern = re.compile(re.escape(token), re.IGNORECASE)
-            result = pattern.sub(lambda m: f'<mark>{m.group()}</mark>', result)
-
-        return result
+    def _highlight_text(self, text: str, pattern: re.Pattern) -> str:
+        """Add <mark> tags around words matching the query pattern."""
+        # Mark every token in a single scan over the text
+        parts = []
+        pos = 0
+        for match in pattern.finditer(text):
+            start, end = match.span()
+            parts.append(text[pos:start])
+            parts.append('<mark>')
+            parts.append(text[start:end])
+            parts.append('</mark>')
+            pos = end
+        parts.append(text[pos:])
+        return ''.join(parts)
 
 
 # Global search index instance
@@ -221,6 +342,19 @@ def add_paper_to_index(paper: Paper):
     search_index.add_paper(paper)
 
 
+def update_paper_field_in_index(paper: Paper, field: str):
+    """Re-index one field ('tag', 'highlight', ...) of a paper in the search index."""
+    search_index.update_field(paper, field)
+
+
+def remove_paper_from_index(paper_id: str):
+    """Remove a deleted paper from the search index."""
+    search_index.remove_paper(paper_id)
+
+
 def search_papers(query: str, limit: int = 50) -> List[SearchResult]:
-    """Search for papers."""
+    """Search for papers; a query that is a paper's DOI or ID returns just that paper."""
+    paper = search_index.lookup(query)
+    if paper:
+        return [SearchResult(paper_id=paper.id, title=paper.title, score=EXACT_MATCH_SCORE, matches=[])]
     return search_index.search(query, limit)
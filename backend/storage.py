@@ -1,17 +1,60 @@
 """JSON file I/O operations for papers."""
-import json
+import functools
+import logging
+import multiprocessing
+import os
 import uuid
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 import fitz  # PyMuPDF
+import orjson
 from pathlib import Path
-from typing import List, Optional
-from datetime import datetime
-from models import Paper, PaperMetadata, Highlight
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from datetime import datetime, timezone
+from models import Paper, PaperMetadata, Author, Highlight, HighlightAnchor
 from config import get_library_path
 
+logger = logging.getLogger(__name__)
 
+# Metadata of every paper in the library, keyed by paper ID, plus a
+# lowercase DOI -> paper ID index; loaded from disk once per library path
+# and kept up to date by save_paper and delete_paper
+_metadata_cache: Optional[Tuple[Path, Dict[str, PaperMetadata], Dict[str, str]]] = None
+
+# Threads used to read metadata files when scanning the library
+SCAN_WORKERS = 32
+
+# Processes used to extract text from long PDFs, page ranges in parallel;
+# shorter PDFs are extracted in-process, where spawning workers isn't worth it
+EXTRACT_WORKERS = min(os.cpu_count() or 1, 4)
+PARALLEL_EXTRACT_MIN_PAGES = 16
+_extract_pool: Optional[ProcessPoolExecutor] = None
+
+# Keys present in every paper and highlight written by save_paper
+_PAPER_FIELDS = frozenset(Paper.model_fields)
+_HIGHLIGHT_FIELDS = frozenset(Highlight.model_fields)
+
+# Fields listed for each paper, i.e. everything but highlights
+_METADATA_FIELDS = tuple(PaperMetadata.model_fields)
+
+# Paper JSON is written compactly; set SCHOLARITA_PRETTY_JSON=1 to indent it
+# for reading by hand
+_JSON_OPTIONS = orjson.OPT_INDENT_2 if os.environ.get("SCHOLARITA_PRETTY_JSON") else 0
+
+
+# Characters of a DOI that can't appear in a paper ID
+_DOI_TRANS = str.maketrans({'/': '-', '.': '-'})
+
+
+@functools.lru_cache(maxsize=4096)
 def slugify_doi(doi: str) -> str:
     """Convert DOI to filesystem-safe ID."""
-    return doi.replace('/', '-').replace('.', '-').lower()
+    return doi.translate(_DOI_TRANS).lower()
+
+
+def utc_now_iso() -> str:
+    """Get the current UTC time as an ISO 8601 string."""
+    # Microseconds are kept so papers imported together still sort by date_added
+    return datetime.now(timezone.utc).isoformat(timespec='microseconds').replace('+00:00', 'Z')
 
 
 def generate_paper_id(doi: Optional[str] = None) -> str:
@@ -21,11 +64,9 @@ def generate_paper_id(doi: Optional[str] = None) -> str:
     return f"uuid-{uuid.uuid4()}"
 
 
-def get_paper_path(paper_id: str) -> tuple[Path, Path, Path]:
-    """Get paths for paper JSON, PDF, and text files."""
-    library_path = get_library_path()
-
-    # Create subdirectories if they don't exist
+@functools.lru_cache(maxsize=8)
+def _library_dirs(library_path: Path) -> Tuple[Path, Path, Path]:
+    """Get a library's metadata, PDF and text directories, creating them on first use."""
     metadata_dir = library_path / "metadata"
     pdfs_dir = library_path / "pdfs"
     text_dir = library_path / "text"
@@ -33,6 +74,12 @@ def get_paper_path(paper_id: str) -> tuple[Path, Path, Path]:
     metadata_dir.mkdir(parents=True, exist_ok=True)
     pdfs_dir.mkdir(parents=True, exist_ok=True)
     text_dir.mkdir(parents=True, exist_ok=True)
+    return metadata_dir, pdfs_dir, text_dir
+
+
+def get_paper_path(paper_id: str) -> tuple[Path, Path, Path]:
+    """Get paths for paper JSON, PDF, and text files."""
+    metadata_dir, pdfs_dir, text_dir = _library_dirs(get_library_path())
 
     json_path = metadata_dir / f"{paper_id}.json"
     pdf_path = pdfs_dir / f"{paper_id}.pdf"
@@ -44,214 +91,508 @@ def get_paper_path(paper_id: str) -> tuple[Path, Path, Path]:
 def paper_exists(paper_id: str) -> bool:
     """Check if a paper exists."""
     json_path, _, _ = get_paper_path(paper_id)
-    return json_path.exists()
+    return os.path.exists(json_path)
+
+
+def _read_json(path: str) -> Optional[dict]:
+    """Read and parse a JSON file, or None if it can't be loaded."""
+    try:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    except Exception as e:
+        logger.warning("Error loading %s: %s", path, e)
+        return None
+
+
+def _scan_metadata_files(library_path: Path) -> Iterator[Tuple[str, dict]]:
+    """Yield (path, data) for each paper JSON file in the library."""
+    metadata_dir, _, _ = _library_dirs(library_path)
+
+    # List names without a stat per file, then read and parse the files on a
+    # thread pool so cold-cache reads overlap
+    with os.scandir(metadata_dir) as entries:
+        json_files = [entry.path for entry in entries if entry.name.endswith(".json")]
+    if not json_files:
+        return
+    with ThreadPoolExecutor(max_workers=min(SCAN_WORKERS, len(json_files))) as executor:
+        for json_file, data in zip(json_files, executor.map(_read_json, json_files)):
+            if data is not None:
+                yield json_file, data
+
+
+def _is_optional_str(value) -> bool:
+    """Check for a value of an Optional[str] field."""
+    return value is None or isinstance(value, str)
+
+
+def _has_trusted_fields(data: dict) -> bool:
+    """Check that stored paper JSON has every field, with the right types.
+
+    model_construct takes field values on trust, so a file that would fail
+    validation must not reach it. These are cheap isinstance checks, not a
+    full validation.
+    """
+    return (
+        _PAPER_FIELDS <= data.keys()
+        and all(isinstance(data[name], str) for name in ('id', 'title', 'date_added', 'date_modified'))
+        and all(_is_optional_str(data[name]) for name in ('doi', 'abstract', 'journal', 'url'))
+        and (data['year'] is None or type(data['year']) is int)
+        and isinstance(data['tags'], list) and all(isinstance(tag, str) for tag in data['tags'])
+        and isinstance(data['authors'], list) and all(
+            isinstance(a, dict) and isinstance(a.get('name'), str) and _is_optional_str(a.get('affiliation'))
+            for a in data['authors']
+        )
+    )
+
+
+def _has_trusted_highlight(hl) -> bool:
+    """Check that a stored highlight has every field, with the right types."""
+    if not (isinstance(hl, dict) and _HIGHLIGHT_FIELDS <= hl.keys()):
+        return False
+    anchor = hl['anchor']
+    return (
+        all(isinstance(hl[name], str) for name in ('id', 'color', 'text', 'created_at'))
+        and type(hl['page']) is int
+        and _is_optional_str(hl['comment'])
+        and isinstance(anchor, dict)
+        and isinstance(anchor.get('start'), dict) and isinstance(anchor.get('end'), dict)
+    )
+
+
+def _metadata_from_paper(paper: Paper) -> PaperMetadata:
+    """Get a paper's metadata; the paper is already validated, so skip revalidation."""
+    fields = {name: getattr(paper, name) for name in _METADATA_FIELDS}
+    fields['authors'] = list(paper.authors)
+    fields['tags'] = list(paper.tags)
+    return PaperMetadata.model_construct(**fields)
+
+
+def _metadata_from_json(data: dict) -> PaperMetadata:
+    """Build a paper's metadata from stored JSON, leaving its highlights untouched.
+
+    Like _paper_from_json, files with every field, of the right types, are
+    trusted and constructed without validation; others are validated, so a
+    malformed file is skipped by the scan rather than breaking the listing.
+    """
+    if not _has_trusted_fields(data):
+        return PaperMetadata.model_validate({k: v for k, v in data.items() if k != 'highlights'})
+
+    fields = {name: data[name] for name in _METADATA_FIELDS}
+    fields['authors'] = [Author.model_construct(**a) for a in data['authors']]
+    return PaperMetadata.model_construct(**fields)
+
+
+def _set_metadata_cache(library_path: Path, papers: Dict[str, PaperMetadata]) -> None:
+    """Replace the metadata cache and rebuild its DOI index."""
+    global _metadata_cache
+    doi_index = {m.doi.lower(): m.id for m in papers.values() if m.doi}
+    _metadata_cache = (library_path, papers, doi_index)
+
+
+def _get_metadata_cache() -> Tuple[Dict[str, PaperMetadata], Dict[str, str]]:
+    """Get the cached metadata and DOI index, scanning the library if needed."""
+    library_path = get_library_path()
+    if _metadata_cache is None or _metadata_cache[0] != library_path:
+        papers: Dict[str, PaperMetadata] = {}
+        for json_file, data in _scan_metadata_files(library_path):
+            try:
+                metadata = _metadata_from_json(data)
+                papers[metadata.id] = metadata
+            except Exception as e:
+                logger.warning("Error loading %s: %s", json_file, e)
+        _set_metadata_cache(library_path, papers)
+    return _metadata_cache[1], _metadata_cache[2]
+
+
+def invalidate_metadata_cache() -> None:
+    """Forget cached metadata so the next lookup rescans the library."""
+    global _metadata_cache
+    _metadata_cache = None
+
+
+def load_all_papers() -> List[Paper]:
+    """Load every paper from disk, refreshing the metadata cache from them.
+
+    Each file is parsed once, instead of once for the paper list and again
+    for each paper.
+    """
+    library_path = get_library_path()
+    papers = []
+    for json_file, data in _scan_metadata_files(library_path):
+        try:
+            papers.append(_paper_from_json(data))
+        except Exception as e:
+            logger.warning("Error loading %s: %s", json_file, e)
+
+    _set_metadata_cache(library_path, {paper.id: _metadata_from_paper(paper) for paper in papers})
+    return papers
+
+
+def _cache_paper(paper: Paper) -> None:
+    """Update the metadata cache after a paper is saved."""
+    papers, doi_index = _get_metadata_cache()
+    old = papers.get(paper.id)
+    if old and old.doi:
+        doi_index.pop(old.doi.lower(), None)
+
+    papers[paper.id] = _metadata_from_paper(paper)
+    if paper.doi:
+        doi_index[paper.doi.lower()] = paper.id
+
+
+def _uncache_paper(paper_id: str) -> None:
+    """Remove a deleted paper from the metadata cache."""
+    papers, doi_index = _get_metadata_cache()
+    old = papers.pop(paper_id, None)
+    if old and old.doi:
+        doi_index.pop(old.doi.lower(), None)
 
 
 def find_paper_by_doi(doi: str) -> Optional[str]:
     """Find a paper ID by its DOI."""
+    _, doi_index = _get_metadata_cache()
+    paper_id = doi_index.get(doi.lower())
+    if paper_id:
+        return paper_id
+
     paper_id = slugify_doi(doi)
     if paper_exists(paper_id):
         return paper_id
-
-    # Also search through all papers in case of ID mismatch
-    for paper in list_papers():
-        if paper.doi and paper.doi.lower() == doi.lower():
-            return paper.id
     return None
 
 
+def _paper_from_json(data: dict) -> Paper:
+    """Build a Paper from stored JSON.
+
+    Files written by save_paper contain every field with the right types, so
+    they are trusted and constructed without validation; anything else (e.g.
+    older or hand-edited files) goes through full validation, which rejects
+    malformed files at load time.
+    """
+    highlights = data.get('highlights')
+    if not (_has_trusted_fields(data) and isinstance(highlights, list)
+            and all(_has_trusted_highlight(hl) for hl in highlights)):
+        return Paper.model_validate(data)
+
+    return Paper.model_construct(**{
+        **data,
+        'authors': [Author.model_construct(**a) for a in data['authors']],
+        'highlights': [
+            Highlight.model_construct(**{**hl, 'anchor': HighlightAnchor.model_construct(**hl['anchor'])})
+            for hl in highlights
+        ],
+    })
+
+
 def load_paper(paper_id: str) -> Optional[Paper]:
     """Load a paper from JSON."""
     json_path, _, _ = get_paper_path(paper_id)
-    if not json_path.exists():
-        return None
-
     try:
-        with open(json_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        return Paper(**data)
+        with open(json_path, 'rb') as f:
+            data = orjson.loads(f.read())
+        return _paper_from_json(data)
+    except FileNotFoundError:
+        return None
     except Exception as e:
-        print(f"Error loading paper {paper_id}: {e}")
+        logger.warning("Error loading paper %s: %s", paper_id, e)
         return None
 
 
+def _write_atomic(path: Path, data: bytes, fsync: bool = False) -> None:
+    """Write a file via a temp file and a rename, so a crash never leaves it half-written.
+
+    The temp name is unique per call, so concurrent writers of the same file
+    don't share one. With fsync the data is flushed to disk before the rename,
+    so the renamed file can't turn up empty after a power loss.
+    """
+    tmp_path = path.with_name(f"{path.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        with open(tmp_path, 'xb') as f:
+            f.write(data)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def _fsync_dir(path: Path) -> None:
+    """Flush a directory's entries, making renames into it durable."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        # Directories can't be opened on Windows
+        return
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def save_papers(papers: List[Paper], fsync: bool = True) -> None:
+    """Save papers to JSON.
+
+    With fsync (the default, for batch edits and imports) each file is
+    flushed before its rename and the metadata directory once at the end, so
+    the whole batch is durable when this returns. Single saves skip both and
+    rely on the atomic rename alone, keeping interactive edits cheap.
+    """
+    if not papers:
+        return
+
+    now = utc_now_iso()
+    for paper in papers:
+        json_path, _, _ = get_paper_path(paper.id)
+        paper.date_modified = now
+        _write_atomic(json_path, orjson.dumps(paper.model_dump(), option=_JSON_OPTIONS), fsync)
+        _cache_paper(paper)
+    if fsync:
+        _fsync_dir(json_path.parent)
+
+
 def save_paper(paper: Paper) -> None:
     """Save a paper to JSON."""
-    json_path, _, _ = get_paper_path(paper.id)
-    paper.date_modified = datetime.utcnow().isoformat() + 'Z'
-
-    with open(json_path, 'w', encoding='utf-8') as f:
-        json.dump(paper.model_dump(), f, indent=2, ensure_ascii=False)
+    save_papers([paper], fsync=False)
 
 
 def delete_paper(paper_id: str) -> bool:
     """Delete a paper, its PDF, and extracted text."""
     json_path, pdf_path, text_path = get_paper_path(paper_id)
 
+    # Unlink directly rather than checking existence first
     deleted = False
-    if json_path.exists():
-        json_path.unlink()
-        deleted = True
-    if pdf_path.exists():
-        pdf_path.unlink()
-        deleted = True
-    if text_path.exists():
-        text_path.unlink()
-        deleted = True
+    for path in (json_path, pdf_path, text_path):
+        try:
+            path.unlink()
+            deleted = True
+        except FileNotFoundError:
+            pass
 
+    _uncache_paper(paper_id)
     return deleted
 
 
 def list_papers() -> List[PaperMetadata]:
     """List all papers (metadata only, no highlights)."""
-    library_path = get_library_path()
-    metadata_dir = library_path / "metadata"
-
-    # Create metadata directory if it doesn't exist
-    metadata_dir.mkdir(parents=True, exist_ok=True)
-
-    papers = []
-    for json_file in metadata_dir.glob("*.json"):
-        try:
-            with open(json_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            # Create PaperMetadata by excluding highlights
-            metadata_data = {k: v for k, v in data.items() if k != 'highlights'}
-            papers.append(PaperMetadata(**metadata_data))
-        except Exception as e:
-            print(f"Error loading {json_file}: {e}")
-            continue
+    papers, _ = _get_metadata_cache()
 
     # Sort by date_added, newest first
-    papers.sort(key=lambda p: p.date_added, reverse=True)
-    return papers
+    return sorted(papers.values(), key=lambda p: p.date_added, reverse=True)
 
 
 def save_pdf(paper_id: str, pdf_content: bytes) -> None:
-    """Save PDF file."""
-    _, pdf_path, _ = get_paper_path(paper_id)
-    with open(pdf_path, 'wb') as f:
-        f.write(pdf_content)
+    """Save PDF file, dropping any text extracted from a previous one."""
+    _, pdf_path, text_path = get_paper_path(paper_id)
+    _write_atomic(pdf_path, pdf_content)
+    try:
+        text_path.unlink()
+    except FileNotFoundError:
+        pass
+
+
+def delete_pdf(paper_id: str) -> None:
+    """Delete a paper's PDF and any text extracted from it."""
+    _, pdf_path, text_path = get_paper_path(paper_id)
+    for path in (pdf_path, text_path):
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
 
 
 def get_pdf_path(paper_id: str) -> Optional[Path]:
     """Get PDF path if it exists."""
     _, pdf_path, _ = get_paper_path(paper_id)
-    return pdf_path if pdf_path.exists() else None
+    return pdf_path if os.path.exists(pdf_path) else None
 
 
-def add_highlight(paper_id: str, highlight: Highlight) -> bool:
-    """Add a highlight to a paper."""
-    paper = load_paper(paper_id)
-    if not paper:
-        return False
+def _patch_paper(paper_id: str, patch: Callable[[dict], bool]) -> Optional[Paper]:
+    """Edit a paper's stored JSON in place. Returns the updated paper.
+
+    `patch` changes the parsed dict and returns False if there was nothing to
+    change. Unlike load_paper + save_paper, the rest of the paper (e.g. its
+    other highlights) is never dumped from models.
+    """
+    json_path, _, _ = get_paper_path(paper_id)
+    try:
+        with open(json_path, 'rb') as f:
+            data = orjson.loads(f.read())
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning("Error loading paper %s: %s", paper_id, e)
+        return None
+
+    if not patch(data):
+        return None
 
-    paper.highlights.append(highlight)
-    save_paper(paper)
-    return True
+    data['date_modified'] = utc_now_iso()
+    paper = _paper_from_json(data)
+    # Files missing fields are written out in full, with their defaults
+    if not _PAPER_FIELDS <= data.keys():
+        data = paper.model_dump()
+    _write_atomic(json_path, orjson.dumps(data, option=_JSON_OPTIONS))
+    _cache_paper(paper)
+    return paper
 
 
-def update_highlight(paper_id: str, highlight_id: str, comment: Optional[str] = None, color: Optional[str] = None, text: Optional[str] = None, anchor: Optional[dict] = None) -> bool:
-    """Update a highlight."""
-    from models import HighlightAnchor
+def add_highlight(paper_id: str, highlight: Highlight) -> Optional[Paper]:
+    """Add a highlight to a paper. Returns the updated paper."""
+    def patch(data: dict) -> bool:
+        data.setdefault('highlights', []).append(highlight.model_dump())
+        return True
 
-    paper = load_paper(paper_id)
-    if not paper:
+    return _patch_paper(paper_id, patch)
+
+
+def update_highlight(paper_id: str, highlight_id: str, comment: Optional[str] = None, color: Optional[str] = None, text: Optional[str] = None, anchor: Optional[dict] = None) -> Optional[Paper]:
+    """Update a highlight. Returns the updated paper."""
+    def patch(data: dict) -> bool:
+        for hl in data.get('highlights', []):
+            if hl.get('id') == highlight_id:
+                if comment is not None:
+                    hl['comment'] = comment
+                if color is not None:
+                    hl['color'] = color
+                if text is not None:
+                    hl['text'] = text
+                if anchor is not None:
+                    # Validate through HighlightAnchor to ensure proper structure
+                    hl['anchor'] = HighlightAnchor(**anchor).model_dump()
+                return True
         return False
 
-    for hl in paper.highlights:
-        if hl.id == highlight_id:
-            if comment is not None:
-                hl.comment = comment
-            if color is not None:
-                hl.color = color
-            if text is not None:
-                hl.text = text
-            if anchor is not None:
-                # Convert dict to HighlightAnchor model to ensure proper structure
-                hl.anchor = HighlightAnchor(**anchor)
-            save_paper(paper)
-            return True
-
-    return False
-
-
-def delete_highlight(paper_id: str, highlight_id: str) -> bool:
-    """Delete a highlight."""
-    paper = load_paper(paper_id)
-    if not paper:
-        return False
+    return _patch_paper(paper_id, patch)
+
 
-    original_length = len(paper.highlights)
-    paper.highlights = [hl for hl in paper.highlights if hl.id != highlight_id]
+def delete_highlight(paper_id: str, highlight_id: str) -> Optional[Paper]:
+    """Delete a highlight. Returns the updated paper."""
+    def patch(data: dict) -> bool:
+        highlights = data.get('highlights', [])
+        data['highlights'] = [hl for hl in highlights if hl.get('id') != highlight_id]
+        return len(data['highlights']) < len(highlights)
 
-    if len(paper.highlights) < original_length:
-        save_paper(paper)
+    return _patch_paper(paper_id, patch)
+
+
+def update_tags(paper_id: str, tags: List[str]) -> Optional[Paper]:
+    """Update paper tags. Returns the updated paper."""
+    def patch(data: dict) -> bool:
+        data['tags'] = tags
         return True
 
-    return False
+    return _patch_paper(paper_id, patch)
 
 
-def update_tags(paper_id: str, tags: List[str]) -> bool:
-    """Update paper tags."""
-    paper = load_paper(paper_id)
-    if not paper:
-        return False
+def bulk_update_tags(paper_ids: List[str], add_tags: List[str], remove_tags: List[str]) -> List[Paper]:
+    """Update tags for multiple papers. Returns the updated papers."""
+    if not paper_ids:
+        return []
 
-    paper.tags = tags
-    save_paper(paper)
-    return True
+    add_tags = list(dict.fromkeys(add_tags))
+    remove_set = set(remove_tags)
+    updated = []
 
+    # Load the papers on a thread pool so file reads overlap
+    with ThreadPoolExecutor(max_workers=min(SCAN_WORKERS, len(paper_ids))) as executor:
+        for paper in executor.map(load_paper, paper_ids):
+            if not paper:
+                continue
 
-def bulk_update_tags(paper_ids: List[str], add_tags: List[str], remove_tags: List[str]) -> int:
-    """Update tags for multiple papers."""
-    updated_count = 0
+            # Add new tags, then remove tags
+            current = set(paper.tags)
+            tags = paper.tags + [tag for tag in add_tags if tag not in current]
+            paper.tags = [tag for tag in tags if tag not in remove_set]
+            updated.append(paper)
 
-    for paper_id in paper_ids:
-        paper = load_paper(paper_id)
-        if not paper:
-            continue
+    save_papers(updated)
+    return updated
 
-        # Add new tags
-        for tag in add_tags:
-            if tag not in paper.tags:
-                paper.tags.append(tag)
 
-        # Remove tags
-        paper.tags = [tag for tag in paper.tags if tag not in remove_tags]
+def _page_texts(doc: fitz.Document, start: int, stop: int) -> List[str]:
+    """Get the non-empty text of pages start..stop-1 of an open PDF."""
+    texts = [doc[page_num].get_text("text") for page_num in range(start, stop)]
+    return [text for text in texts if text]
 
-        save_paper(paper)
-        updated_count += 1
 
-    return updated_count
+def _extract_pages(pdf_path: str, start: int, stop: int) -> List[str]:
+    """Extract the text of a range of pages; runs in a worker process."""
+    with fitz.open(pdf_path) as doc:
+        return _page_texts(doc, start, stop)
 
 
-def extract_text_from_pdf(paper_id: str) -> Optional[str]:
-    """Extract full text from a PDF file."""
-    _, pdf_path, _ = get_paper_path(paper_id)
+def _get_extract_pool() -> ProcessPoolExecutor:
+    """Get the process pool for text extraction, starting it on first use.
 
-    if not pdf_path.exists():
-        print(f"PDF not found for paper {paper_id}")
-        return None
+    Workers are spawned rather than forked: the pool is started from a worker
+    thread of a multi-threaded server, and a forked child could inherit locks
+    held by other threads and deadlock.
+    """
+    global _extract_pool
+    if _extract_pool is None:
+        _extract_pool = ProcessPoolExecutor(
+            max_workers=EXTRACT_WORKERS, mp_context=multiprocessing.get_context("spawn")
+        )
+    return _extract_pool
 
-    try:
-        doc = fitz.open(pdf_path)
-        text_parts = []
 
-        for page_num in range(len(doc)):
-            page = doc[page_num]
-            text = page.get_text()
-            if text:
-                text_parts.append(text)
+def _extract_pages_parallel(pdf_path: Path, page_count: int) -> List[str]:
+    """Extract a PDF's pages in contiguous ranges, one per worker process."""
+    step = -(-page_count // EXTRACT_WORKERS)
+    starts = range(0, page_count, step)
+    stops = [min(start + step, page_count) for start in starts]
+    text_parts = []
+    for part in _get_extract_pool().map(_extract_pages, [str(pdf_path)] * len(starts), starts, stops):
+        text_parts.extend(part)
+    return text_parts
 
-        doc.close()
+
+def close_extract_pool() -> None:
+    """Shut down the text extraction process pool, if it was started."""
+    global _extract_pool
+    if _extract_pool is not None:
+        _extract_pool.shutdown()
+        _extract_pool = None
+
+
+def validate_and_extract_text(paper_id: str) -> Tuple[bool, Optional[str]]:
+    """Open a paper's PDF once, checking it and extracting its full text.
+    Returns: (is_valid, text); a PDF is valid if it opens and has pages."""
+    _, pdf_path, _ = get_paper_path(paper_id)
+
+    try:
+        # Opened directly; fitz.open does its own existence check
+        with fitz.open(pdf_path) as doc:
+            page_count = len(doc)
+            if page_count == 0:
+                return False, None
+            # Worker processes (e.g. during migration) don't start pools of their own
+            if page_count >= PARALLEL_EXTRACT_MIN_PAGES and EXTRACT_WORKERS > 1 \
+                    and multiprocessing.parent_process() is None:
+                text_parts = _extract_pages_parallel(pdf_path, page_count)
+            else:
+                text_parts = _page_texts(doc, 0, page_count)
 
         full_text = "\n\n".join(text_parts)
-        return full_text if full_text.strip() else None
+        return True, full_text if full_text.strip() else None
 
+    except fitz.FileNotFoundError:
+        logger.debug("PDF not found for paper %s", paper_id)
+        return False, None
     except Exception as e:
-        print(f"Error extracting text from PDF {paper_id}: {e}")
-        return None
+        logger.warning("Error extracting text from PDF %s: %s", paper_id, e)
+        return False, None
+
+
+def extract_text_from_pdf(paper_id: str) -> Optional[str]:
+    """Extract full text from a PDF file."""
+    _, text = validate_and_extract_text(paper_id)
+    return text
 
 
 def save_extracted_text(paper_id: str, text: str) -> None:
@@ -266,14 +607,13 @@ def load_extracted_text(paper_id: str) -> Optional[str]:
     """Load extracted text from file."""
     _, _, text_path = get_paper_path(paper_id)
 
-    if not text_path.exists():
-        return None
-
     try:
         with open(text_path, 'r', encoding='utf-8') as f:
             return f.read()
+    except FileNotFoundError:
+        return None
     except Exception as e:
-        print(f"Error loading extracted text for {paper_id}: {e}")
+        logger.warning("Error loading extracted text for %s: %s", paper_id, e)
         return None
 
 
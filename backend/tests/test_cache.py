@@ -0,0 +1,97 @@
+"""Tests for cache module."""
+import asyncio
+import os
+import time
+import pytest
+import tempfile
+import shutil
+from pathlib import Path
+import config
+import cache
+from cache import async_ttl_cache, async_single_flight, disk_cache_get, disk_cache_put
+
+
+@pytest.fixture
+def temp_root(monkeypatch):
+    """Create a temporary library root for the disk cache."""
+    temp_dir = Path(tempfile.mkdtemp())
+    monkeypatch.setattr(config, 'LIBRARY_ROOT', temp_dir)
+
+    yield temp_dir
+
+    # Cleanup
+    shutil.rmtree(temp_dir)
+
+
+def test_disk_cache_expires(temp_root):
+    """Test that disk entries older than the TTL are ignored."""
+    disk_cache_put("pages", "https://example.org", b"<html></html>")
+    assert disk_cache_get("pages", "https://example.org") == b"<html></html>"
+
+    # Age the entry past the TTL
+    path = next((temp_root / ".cache" / "pages").iterdir())
+    old = time.time() - 120
+    os.utime(path, (old, old))
+    assert disk_cache_get("pages", "https://example.org", ttl=60) is None
+    assert disk_cache_get("pages", "https://example.org/missing") is None
+
+
+def test_async_ttl_cache_evicts_least_recently_used():
+    """Test that the in-memory cache is bounded by maxsize."""
+    calls = []
+
+    @async_ttl_cache(maxsize=2)
+    async def lookup(key):
+        calls.append(key)
+        return key.upper()
+
+    async def run():
+        for key in ["a", "b", "a", "c", "a", "b"]:
+            await lookup(key)
+
+    asyncio.run(run())
+    # "b" was evicted when "c" was added, since "a" had been used more recently
+    assert calls == ["a", "b", "c", "b"]
+
+
+def test_async_ttl_cache_drops_expired_entries(monkeypatch):
+    """Test that expired entries are refetched and purged rather than kept."""
+    now = [1000.0]
+    monkeypatch.setattr(cache.time, 'monotonic', lambda: now[0])
+    calls = []
+
+    @async_ttl_cache(ttl=10, negative_ttl=1)
+    async def lookup(key):
+        calls.append(key)
+        return None if key == "miss" else key
+
+    async def run():
+        await lookup("miss")
+        await lookup("a")
+        now[0] += 5
+        # "miss" has expired; adding "b" purges it, "a" is still fresh
+        await lookup("b")
+        await lookup("a")
+        await lookup("miss")
+
+    asyncio.run(run())
+    assert calls == ["miss", "a", "b", "miss"]
+
+
+def test_async_single_flight_shares_only_concurrent_calls():
+    """Test that concurrent calls share one run and later calls run again."""
+    calls = []
+
+    @async_single_flight
+    async def fetch(key):
+        calls.append(key)
+        await asyncio.sleep(0.01)
+        return key.upper()
+
+    async def run():
+        first = await asyncio.gather(fetch("a"), fetch("a"), fetch("b"))
+        second = await fetch("a")
+        return first, second
+
+    assert asyncio.run(run()) == (["A", "A", "B"], "A")
+    assert calls == ["a", "b", "a"]
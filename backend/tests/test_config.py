@@ -0,0 +1,42 @@
+"""Tests for config module."""
+import pytest
+import tempfile
+import shutil
+from pathlib import Path
+import config
+from config import load_config, save_config
+
+
+@pytest.fixture
+def temp_config(monkeypatch):
+    """Point config.json at a temporary directory."""
+    temp_dir = Path(tempfile.mkdtemp())
+    monkeypatch.setattr(config, 'CONFIG_PATH', temp_dir / "config.json")
+    monkeypatch.setattr(config, '_config_cache', None)
+
+    yield temp_dir / "config.json"
+
+    # Cleanup
+    shutil.rmtree(temp_dir)
+
+
+def test_load_config_creates_default(temp_config):
+    """Test that a default config is written when none exists."""
+    cfg = load_config()
+    assert temp_config.exists()
+    assert cfg.scihub_domain == "sci-hub.se"
+
+
+def test_load_config_cached(temp_config):
+    """Test that repeated loads reuse the cached config."""
+    first = load_config()
+    second = load_config()
+    assert first is second
+
+
+def test_save_config_updates_cache(temp_config):
+    """Test that saving a config is visible to the next load."""
+    cfg = load_config()
+    updated = cfg.model_copy(update={'scihub_domain': 'sci-hub.ru'})
+    save_config(updated)
+    assert load_config().scihub_domain == "sci-hub.ru"
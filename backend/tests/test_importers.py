@@ -1,6 +1,31 @@
 """Tests for importers module."""
+import asyncio
+import fitz
+import httpx
 import pytest
-from importers import extract_doi_from_input
+import shutil
+import tempfile
+from pathlib import Path
+import config
+import http_client
+import importers
+from importers import (
+    extract_doi_from_input, fetch_metadata, download_pdf_from_url, download_first_pdf,
+    fetch_pdf_scihub, fetch_pdf, import_by_dois, looks_like_pdf
+)
+from models import Config
+
+
+@pytest.fixture(autouse=True)
+def isolated_caches(monkeypatch):
+    """Start each test with empty lookup caches in a temporary library."""
+    temp_dir = Path(tempfile.mkdtemp())
+    monkeypatch.setattr(config, 'LIBRARY_ROOT', temp_dir)
+    importers.fetch_metadata.cache_clear()
+
+    yield
+
+    shutil.rmtree(temp_dir)
 
 
 def test_extract_doi_direct():
@@ -21,6 +46,12 @@ def test_extract_doi_from_arxiv():
     assert doi == "arXiv:2301.12345"
 
 
+def test_extract_doi_from_biorxiv():
+    """Test extracting DOI from bioRxiv URL (which itself contains a DOI)."""
+    doi = extract_doi_from_input("https://www.biorxiv.org/content/10.1101/2020.01.01.123456v1")
+    assert doi == "bioRxiv:10.1101/2020.01.01.123456"
+
+
 def test_extract_doi_invalid():
     """Test with invalid input."""
     doi = extract_doi_from_input("not a valid doi or url")
@@ -33,3 +64,331 @@ def test_extract_doi_from_paper_url():
     # This might not extract a DOI since it's not in the URL
     # But if the URL contains the DOI pattern, it should work
     pass  # This is more of an integration test with actual URLs
+
+
+def test_scheme():
+    """Test identifier classification by prefix."""
+    assert importers._scheme("arXiv:2301.12345") == "arxiv"
+    assert importers._scheme("bioRxiv:10.1101/2024.01.01.123456") == "biorxiv"
+    assert importers._scheme("10.1038/nature12345") == "doi"
+    assert importers._scheme("10.1002/(SICI)1097-4636:AID") == "doi"
+
+
+def test_fetch_metadata_prefers_semantic_scholar(monkeypatch):
+    """Test that Semantic Scholar wins even when CrossRef answers first."""
+    async def slow_ss(doi):
+        await asyncio.sleep(0.01)
+        return {'title': 'From SS'}
+
+    async def fast_cr(doi):
+        return {'title': 'From CrossRef'}
+
+    monkeypatch.setattr(importers, 'fetch_metadata_semantic_scholar', slow_ss)
+    monkeypatch.setattr(importers, 'fetch_metadata_crossref', fast_cr)
+
+    metadata, source = asyncio.run(fetch_metadata("10.1038/nature12345"))
+    assert source == 'semantic_scholar'
+    assert metadata['title'] == 'From SS'
+
+
+def test_fetch_metadata_falls_back_to_crossref(monkeypatch):
+    """Test CrossRef fallback when Semantic Scholar has no record."""
+    async def empty_ss(doi):
+        return None
+
+    async def slow_cr(doi):
+        await asyncio.sleep(0.01)
+        return {'title': 'From CrossRef'}
+
+    monkeypatch.setattr(importers, 'fetch_metadata_semantic_scholar', empty_ss)
+    monkeypatch.setattr(importers, 'fetch_metadata_crossref', slow_cr)
+
+    metadata, source = asyncio.run(fetch_metadata("10.1038/nature12345"))
+    assert source == 'crossref'
+    assert metadata['title'] == 'From CrossRef'
+
+
+def test_metadata_and_download_timeouts(monkeypatch):
+    """Test that API lookups and PDF downloads use their own deadlines."""
+    timeouts = {}
+
+    def handler(request):
+        timeouts[request.url.host] = request.extensions['timeout']['read']
+        if request.url.host == 'api.crossref.org':
+            return httpx.Response(200, json={'message': {'title': ['T']}})
+        return httpx.Response(200, headers={'content-type': 'application/pdf'}, content=b'%PDF-1.4')
+
+    monkeypatch.setattr(http_client, '_client', httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+
+    asyncio.run(importers.fetch_metadata_crossref("10.1038/nature12345"))
+    asyncio.run(download_pdf_from_url("https://example.org/paper.pdf"))
+    assert timeouts == {
+        'api.crossref.org': http_client.API_TIMEOUT.read,
+        'example.org': http_client.DOWNLOAD_TIMEOUT.read,
+    }
+
+
+def test_download_pdf_checks_magic_bytes(monkeypatch):
+    """Test that only bodies starting with %PDF are accepted."""
+    def handler(request):
+        if request.url.path == '/real.pdf':
+            return httpx.Response(200, headers={'content-type': 'application/pdf'}, content=b'%PDF-1.4 body')
+        if request.url.path == '/fake.pdf':
+            return httpx.Response(200, headers={'content-type': 'application/pdf'}, content=b'<html></html>')
+        return httpx.Response(200, headers={'content-type': 'text/html'}, content=b'<html></html>')
+
+    monkeypatch.setattr(http_client, '_client', httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+
+    assert asyncio.run(download_pdf_from_url("https://example.org/real.pdf")) == b'%PDF-1.4 body'
+    assert asyncio.run(download_pdf_from_url("https://example.org/fake.pdf")) is None
+    assert asyncio.run(download_pdf_from_url("https://example.org/page")) is None
+
+
+def test_download_first_pdf_returns_valid_candidate(monkeypatch):
+    """Test that the first candidate yielding a PDF wins."""
+    def handler(request):
+        if request.url.path == '/good.pdf':
+            return httpx.Response(200, headers={'content-type': 'application/pdf'}, content=b'%PDF-1.4 good')
+        return httpx.Response(404)
+
+    monkeypatch.setattr(http_client, '_client', httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+
+    urls = [f"https://example.org/bad{i}.pdf" for i in range(5)] + ["https://example.org/good.pdf"]
+    assert asyncio.run(download_first_pdf(urls)) == b'%PDF-1.4 good'
+    assert asyncio.run(download_first_pdf(urls[:5])) is None
+
+
+def test_fetch_pdf_scihub_follows_embedded_link(monkeypatch):
+    """Test that a relative <embed> link on the Sci-Hub page is downloaded."""
+    requested = []
+
+    def handler(request):
+        requested.append(str(request.url))
+        if request.url.path == '/storage/abc/paper.pdf':
+            return httpx.Response(200, headers={'content-type': 'application/pdf'}, content=b'%PDF-1.4 scihub')
+        html = '<html><embed type="application/pdf" src="/storage/abc/paper.pdf#view=FitH"></html>'
+        return httpx.Response(200, headers={'content-type': 'text/html'}, text=html)
+
+    config = Config(
+        scihub_domain="sci-hub.test", library_path="./papers", highlight_colors=["yellow"],
+        default_highlight_color="yellow", remember_last_color=True
+    )
+    monkeypatch.setattr(importers, 'load_config', lambda: config)
+    monkeypatch.setattr(http_client, '_client', httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+
+    assert asyncio.run(fetch_pdf_scihub("10.1038/nature12345")) == b'%PDF-1.4 scihub'
+    assert "https://sci-hub.test/storage/abc/paper.pdf" in requested
+
+
+def test_fetch_pdf_scihub_falls_back_when_embedded_links_fail(monkeypatch):
+    """Test that a stale viewer iframe doesn't stop the generic .pdf fallback."""
+    requested = []
+
+    def handler(request):
+        requested.append(str(request.url))
+        if request.url.path == '/mirror/paper.pdf':
+            return httpx.Response(200, headers={'content-type': 'application/pdf'}, content=b'%PDF-1.4 mirror')
+        if request.url.path.endswith('.pdf'):
+            return httpx.Response(404)
+        html = '<iframe src="/stale/paper.pdf"></iframe><script>var u = "/mirror/paper.pdf";</script>'
+        return httpx.Response(200, headers={'content-type': 'text/html'}, text=html)
+
+    # A host outside the shared Sci-Hub token bucket keeps the test fast
+    config = Config(
+        scihub_domain="mirror.test", library_path="./papers", highlight_colors=["yellow"],
+        default_highlight_color="yellow", remember_last_color=True
+    )
+    monkeypatch.setattr(importers, 'load_config', lambda: config)
+    monkeypatch.setattr(http_client, '_client', httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+
+    assert asyncio.run(fetch_pdf_scihub("10.1038/nature12345")) == b'%PDF-1.4 mirror'
+    # The failed iframe URL isn't probed a second time
+    assert requested.count("https://mirror.test/stale/paper.pdf") == 1
+
+
+def test_fetch_page_keeps_pages_without_candidates_briefly(monkeypatch):
+    """Test that pages with no PDF link are cached only for the short miss TTL."""
+    html = {'/hit': '<a href="/paper.pdf">PDF</a>', '/miss': '<p>Captcha</p>'}
+
+    def handler(request):
+        return httpx.Response(200, headers={'content-type': 'text/html'}, text=html[request.url.path])
+
+    monkeypatch.setattr(http_client, '_client', httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+
+    for path in html:
+        url = f"https://pages.test{path}"
+        assert asyncio.run(importers._fetch_page(url, importers._scihub_has_candidate)) == (url, html[path])
+
+    assert importers.disk_cache_get("pages", "https://pages.test/hit") is not None
+    assert importers.disk_cache_get("pages", "https://pages.test/miss") is None
+    assert importers.disk_cache_get("page-misses", "https://pages.test/miss") is not None
+
+    # Once the miss TTL has passed the page is fetched again
+    monkeypatch.setattr(importers, 'PAGE_MISS_TTL', -1)
+    html['/miss'] = '<embed src="/paper.pdf">'
+    url = "https://pages.test/miss"
+    assert asyncio.run(importers._fetch_page(url, importers._scihub_has_candidate)) == (url, html['/miss'])
+
+
+def test_normalize_pdf_url():
+    """Test that protocol-relative and relative links resolve against the page."""
+    base = "https://sci-hub.test/"
+    assert importers._normalize_pdf_url("//cdn.test/a.pdf#view=FitH", base) == "https://cdn.test/a.pdf"
+    assert importers._normalize_pdf_url("/storage/a.pdf", base) == "https://sci-hub.test/storage/a.pdf"
+    assert importers._normalize_pdf_url("storage/a.pdf", base) == "https://sci-hub.test/storage/a.pdf"
+    assert importers._normalize_pdf_url("http://other.test/a.pdf", base) == "http://other.test/a.pdf"
+
+
+def test_any_pdf_pattern_keeps_document_order():
+    """Test that the fallback pattern finds absolute and relative PDF URLs in order."""
+    html = 'var a = "/files/first.pdf"; var b = "https://cdn.test/x/second.pdf"; <p>//mirror.test/third.PDF</p>'
+    urls = [m.group() for m in importers._ANY_PDF_RE.finditer(html)]
+    assert urls == ["/files/first.pdf", "https://cdn.test/x/second.pdf", "//mirror.test/third.PDF"]
+
+
+def test_fetch_metadata_cached_by_doi(monkeypatch):
+    """Test that repeated and concurrent lookups of a DOI hit the API once."""
+    calls = []
+
+    async def counting_ss(doi):
+        calls.append(doi)
+        await asyncio.sleep(0.01)
+        return {'title': 'Cached'}
+
+    async def empty_cr(doi):
+        return None
+
+    monkeypatch.setattr(importers, 'fetch_metadata_semantic_scholar', counting_ss)
+    monkeypatch.setattr(importers, 'fetch_metadata_crossref', empty_cr)
+
+    async def run():
+        first, second = await asyncio.gather(
+            fetch_metadata("10.1038/cached1"), fetch_metadata("10.1038/cached1")
+        )
+        third = await fetch_metadata("10.1038/cached1")
+        return first, second, third
+
+    results = asyncio.run(run())
+    assert len(calls) == 1
+    assert all(r == ({'title': 'Cached'}, 'semantic_scholar') for r in results)
+
+    # A fresh process would reuse the on-disk copy
+    importers.fetch_metadata.cache_clear()
+    assert asyncio.run(fetch_metadata("10.1038/cached1")) == ({'title': 'Cached'}, 'semantic_scholar')
+    assert len(calls) == 1
+
+
+def make_pdf(text: str) -> bytes:
+    """Build a one-page PDF containing the given text."""
+    doc = fitz.open()
+    page = doc.new_page()
+    page.insert_text((72, 72), text)
+    content = doc.tobytes()
+    doc.close()
+    return content
+
+
+def test_import_by_dois_keeps_input_order(monkeypatch):
+    """Test that batch import returns one result per DOI in input order."""
+    pdf = make_pdf("batch")
+
+    async def fake_metadata(doi):
+        await asyncio.sleep(0.001 * (5 - int(doi[-1])))
+        if doi.endswith('3'):
+            return None, None
+        return {'title': f"Paper {doi}", 'authors': []}, 'crossref'
+
+    async def fake_pdf(doi, metadata=None):
+        return pdf if doi.endswith(('0', '2')) else None
+
+    monkeypatch.setattr(importers, 'fetch_metadata', fake_metadata)
+    monkeypatch.setattr(importers, 'fetch_pdf', fake_pdf)
+
+    dois = [f"10.1000/batch{i}" for i in range(5)]
+    results = asyncio.run(import_by_dois(dois, metadata_workers=2, pdf_workers=2))
+
+    assert [status for _, _, status in results] == ['success', 'partial', 'success', 'error', 'partial']
+    assert results[0][0].doi == "10.1000/batch0"
+    assert results[0][1] == pdf
+    assert results[3][0] is None
+
+
+def test_import_by_dois_isolates_failures(monkeypatch):
+    """Test that an exception for one DOI doesn't abort the rest of the batch."""
+    async def fake_metadata(doi):
+        if doi.endswith('1'):
+            raise RuntimeError("metadata boom")
+        return {'title': f"Paper {doi}", 'authors': []}, 'crossref'
+
+    async def fake_pdf(doi, metadata=None):
+        if doi.endswith('2'):
+            raise RuntimeError("pdf boom")
+        return None
+
+    monkeypatch.setattr(importers, 'fetch_metadata', fake_metadata)
+    monkeypatch.setattr(importers, 'fetch_pdf', fake_pdf)
+
+    dois = [f"10.1000/batch{i}" for i in range(3)]
+    results = asyncio.run(import_by_dois(dois))
+
+    assert [status for _, _, status in results] == ['partial', 'error', 'partial']
+    assert results[2][0].doi == "10.1000/batch2"
+
+
+def test_looks_like_pdf(monkeypatch):
+    """Test HEAD preflight with a ranged GET fallback."""
+    def handler(request):
+        if request.url.path == '/head-ok.pdf':
+            return httpx.Response(200, headers={'content-type': 'application/pdf'})
+        if request.url.path == '/no-head.pdf':
+            if request.method == 'HEAD':
+                return httpx.Response(405)
+            return httpx.Response(206, content=b'%PDF-1.')
+        if request.url.path == '/style.pdf':
+            if request.method == 'HEAD':
+                return httpx.Response(200, headers={'content-type': 'text/css'})
+            return httpx.Response(200, content=b'body {}')
+        return httpx.Response(404)
+
+    monkeypatch.setattr(http_client, '_client', httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+
+    assert asyncio.run(looks_like_pdf("https://example.org/head-ok.pdf"))
+    assert asyncio.run(looks_like_pdf("https://example.org/no-head.pdf"))
+    assert not asyncio.run(looks_like_pdf("https://example.org/style.pdf"))
+    assert not asyncio.run(looks_like_pdf("https://example.org/missing.pdf"))
+
+
+def test_fetch_pdf_tries_sources_concurrently(monkeypatch):
+    """Test that a publisher PDF is returned without waiting on slower sources."""
+    pdf = make_pdf("plos")
+
+    async def handler(request):
+        if request.url.host == 'journals.plos.org':
+            return httpx.Response(200, headers={'content-type': 'application/pdf'}, content=pdf)
+        # Unpaywall is slow and has nothing
+        await asyncio.sleep(1)
+        return httpx.Response(404)
+
+    async def no_scihub(doi):
+        raise AssertionError("Sci-Hub should not be tried")
+
+    monkeypatch.setattr(importers, 'fetch_pdf_scihub', no_scihub)
+    monkeypatch.setattr(http_client, '_client', httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+
+    assert asyncio.run(asyncio.wait_for(fetch_pdf("10.1371/journal.pone.0000001"), 0.5)) == pdf
+
+
+def test_fetch_pdf_downloads_duplicate_urls_once(monkeypatch):
+    """Test that a URL offered by several sources is only downloaded once."""
+    pdf = make_pdf("arxiv")
+    requested = []
+
+    def handler(request):
+        requested.append(str(request.url))
+        return httpx.Response(200, headers={'content-type': 'application/pdf'}, content=pdf)
+
+    monkeypatch.setattr(http_client, '_client', httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+
+    metadata = {'pdf_url': "https://arxiv.org/pdf/2301.12345.pdf"}
+    assert asyncio.run(fetch_pdf("arXiv:2301.12345", metadata)) == pdf
+    assert requested.count("https://arxiv.org/pdf/2301.12345.pdf") == 1
@@ -0,0 +1,56 @@
+"""Tests for ratelimit module."""
+import asyncio
+import time
+import httpx
+import http_client
+import ratelimit
+from ratelimit import AsyncTokenBucket, get_with_retry
+
+
+def test_token_bucket_spaces_requests():
+    """Test that requests beyond the burst wait for new tokens."""
+    bucket = AsyncTokenBucket(rate=20, burst=1)
+
+    async def run():
+        start = time.monotonic()
+        for _ in range(3):
+            await bucket.acquire()
+        return time.monotonic() - start
+
+    # First request uses the burst, the next two wait ~50ms each
+    assert asyncio.run(run()) >= 0.09
+
+
+def test_get_with_retry_honours_retry_after(monkeypatch):
+    """Test that a 429 is retried and the later success returned."""
+    responses = [
+        httpx.Response(429, headers={'retry-after': '0'}),
+        httpx.Response(200, json={'ok': True}),
+    ]
+
+    def handler(request):
+        return responses.pop(0)
+
+    monkeypatch.setattr(http_client, '_client', httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+
+    async def run():
+        return await get_with_retry("https://example.org/api")
+
+    response = asyncio.run(run())
+    assert response.status_code == 200
+    assert not responses
+
+
+def test_get_with_retry_gives_up(monkeypatch):
+    """Test that the last response is returned once attempts run out."""
+    monkeypatch.setattr(ratelimit, 'MAX_BACKOFF', 0)
+
+    def handler(request):
+        return httpx.Response(503)
+
+    monkeypatch.setattr(http_client, '_client', httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+
+    async def run():
+        return await get_with_retry("https://example.org/api")
+
+    assert asyncio.run(run()).status_code == 503
@@ -0,0 +1,148 @@
+"""Tests for search module."""
+import search
+from models import Paper, Highlight, HighlightAnchor
+from search import SearchIndex
+
+
+def test_tokenize_drops_stopwords_and_short_words():
+    """Test that tokenization lowercases and filters stopwords and 1-char words."""
+    index = SearchIndex()
+    assert index.tokenize("The Neural Networks of a Brain, v2") == ["neural", "networks", "brain", "v2"]
+    assert index.tokenize("") == []
+
+
+def highlight(index: SearchIndex, text: str, query: str) -> str:
+    """Mark a query's tokens in text, as search() does for snippets."""
+    return index._highlight_text(text, search._mark_pattern(tuple(index.tokenize(query))))
+
+
+def test_highlight_text_marks_query_tokens():
+    """Test that query tokens are wrapped in <mark> tags case-insensitively."""
+    index = SearchIndex()
+    assert highlight(index, "Neural nets and neurons", "neural NETS") == \
+        "<mark>Neural</mark> <mark>nets</mark> and neurons"
+
+
+def test_highlight_text_prefers_longest_overlapping_token():
+    """Test that overlapping tokens are marked once, by the longest match."""
+    index = SearchIndex()
+    assert highlight(index, "Network of nets", "net network") == \
+        "<mark>Network</mark> of <mark>net</mark>s"
+    # Query tokens that look like markup don't corrupt earlier marks
+    assert highlight(index, "mark my words", "mark") == "<mark>mark</mark> my words"
+
+
+def make_paper(paper_id: str, title: str, tags=()) -> Paper:
+    """Build a minimal paper for indexing."""
+    return Paper(id=paper_id, title=title, date_added="now", date_modified="now", tags=list(tags))
+
+
+def test_reindexing_and_removing_a_paper(monkeypatch):
+    """Test that re-adding replaces old postings and removal drops them."""
+    monkeypatch.setattr(search, 'get_or_extract_text', lambda paper_id: None)
+    index = SearchIndex()
+    index.add_paper(make_paper("p1", "Neural coding", tags=["draft"]))
+    index.add_paper(make_paper("p2", "Neural circuits"))
+
+    # Re-index p1 with a new tag; the old tag no longer matches
+    index.add_paper(make_paper("p1", "Neural coding", tags=["review"]))
+    assert index.search("draft") == []
+    assert [r.paper_id for r in index.search("review")] == ["p1"]
+    assert index.search("coding")[0].score == 10
+
+    index.remove_paper("p1")
+    assert [r.paper_id for r in index.search("neural")] == ["p2"]
+    assert "coding" not in index.postings
+
+
+def test_search_scores_and_highlight_matches(monkeypatch):
+    """Test field-weighted scoring and page-tagged highlight matches."""
+    monkeypatch.setattr(search, 'get_or_extract_text', lambda paper_id: None)
+    index = SearchIndex()
+    paper = make_paper("p1", "Dopamine signals")
+    paper.highlights = [Highlight(
+        id="h1", page=3, color="yellow", text="dopamine release", created_at="now",
+        anchor=HighlightAnchor(start={'page': 3, 'offset': 0}, end={'page': 3, 'offset': 16})
+    )]
+    index.add_paper(paper)
+
+    [result] = index.search("dopamine")
+    assert result.score == 10 + 6
+    assert [(m.field, m.page) for m in result.matches] == [("title", None), ("highlight", 3)]
+    assert result.matches[1].snippet == "<mark>dopamine</mark> release"
+
+    # Repeating a query word doesn't double its score or its matches
+    [repeated] = index.search("dopamine DOPAMINE")
+    assert repeated.score == result.score
+    assert repeated.matches == result.matches
+
+
+def test_update_field_matches_full_reindex(monkeypatch):
+    """Test that re-indexing one field leaves the index as a full re-index would."""
+    monkeypatch.setattr(search, 'get_or_extract_text', lambda paper_id: "tagged text body")
+    paper = make_paper("p1", "Tagged tagged title", tags=["old"])
+    paper.abstract = "An abstract about tags"
+
+    index = SearchIndex()
+    index.add_paper(paper)
+    paper.tags = ["tagged", "new"]
+    index.update_field(paper, 'tag')
+
+    expected = SearchIndex()
+    expected.add_paper(paper)
+
+    assert dict(index.postings) == dict(expected.postings)
+    assert dict(index.fields) == dict(expected.fields)
+    assert index.fields["tagged"]["p1"] == ["title", "tag", "fulltext"]
+    assert "old" not in index.postings
+
+
+def test_search_papers_shortcuts_doi_and_id_queries(monkeypatch):
+    """Test that a query naming a paper's DOI or ID returns it without scoring."""
+    monkeypatch.setattr(search, 'get_or_extract_text', lambda paper_id: None)
+    monkeypatch.setattr(search, 'find_paper_by_doi', lambda doi: "p1" if doi == "10.1000/abc" else None)
+    index = SearchIndex()
+    index.add_paper(make_paper("p1", "Neural coding"))
+    index.add_paper(make_paper("p2", "Neural circuits"))
+    monkeypatch.setattr(search, 'search_index', index)
+
+    for query in ("p1", " 10.1000/abc ", "https://doi.org/10.1000/abc"):
+        results = search.search_papers(query)
+        assert [r.paper_id for r in results] == ["p1"]
+        assert results[0].score == search.EXACT_MATCH_SCORE
+
+    # Unknown DOIs and multi-word queries fall through to the index
+    assert search.search_papers("10.1000/zzz") == []
+    assert {r.paper_id for r in search.search_papers("neural p1")} == {"p1", "p2"}
+
+
+def test_repeated_tokens_count_once_per_field(monkeypatch):
+    """Test that a token repeated within a field adds its weight only once."""
+    monkeypatch.setattr(search, 'get_or_extract_text', lambda paper_id: None)
+    index = SearchIndex()
+    paper = make_paper("p1", "Neural coding")
+    paper.abstract = "Neural activity, neural codes and more neural data"
+    paper.highlights = [Highlight(
+        id="h1", page=2, color="yellow", text="neural neural", created_at="now",
+        anchor=HighlightAnchor(start={'page': 2, 'offset': 0}, end={'page': 2, 'offset': 13})
+    )]
+    index.add_paper(paper)
+
+    assert index.postings["neural"]["p1"] == 10 + 6 + 4
+    assert index.highlight_hits[("p1", "neural")] == [(2, "neural neural")]
+
+    index.remove_paper("p1")
+    assert "neural" not in index.postings
+
+
+def test_matches_report_each_field_once_in_field_order(monkeypatch):
+    """Test that a field matched by several query words yields one snippet."""
+    monkeypatch.setattr(search, 'get_or_extract_text', lambda paper_id: None)
+    index = SearchIndex()
+    paper = make_paper("p1", "Sparse neural coding", tags=["coding"])
+    paper.abstract = "Neural codes are sparse"
+    index.add_paper(paper)
+
+    [result] = index.search("sparse coding neural")
+    assert [m.field for m in result.matches] == ["title", "tag", "abstract"]
+    assert result.matches[0].snippet == "<mark>Sparse</mark> <mark>neural</mark> <mark>coding</mark>"
@@ -8,9 +8,16 @@ from models import Paper, Author, Highlight, HighlightAnchor
 from storage import (
     slugify_doi, generate_paper_id, save_paper, load_paper,
     paper_exists, find_paper_by_doi, delete_paper, save_pdf,
-    get_pdf_path, save_extracted_text, get_paper_path
+    get_pdf_path, save_extracted_text, get_paper_path, utc_now_iso,
+    update_tags, bulk_update_tags, list_papers, invalidate_metadata_cache,
+    add_highlight, update_highlight, delete_highlight,
+    load_all_papers, extract_text_from_pdf, close_extract_pool,
+    validate_and_extract_text, delete_pdf, save_papers
 )
+import fitz
+import orjson
 import config
+import storage
 
 
 @pytest.fixture
@@ -46,6 +53,16 @@ def test_generate_paper_id():
     assert paper_id.startswith("uuid-")
 
 
+def test_utc_now_iso():
+    """Test that timestamps are ISO 8601 UTC strings ending in Z."""
+    now = utc_now_iso()
+    assert now.endswith("Z")
+    parsed = datetime.fromisoformat(now[:-1])
+    assert abs((datetime.utcnow() - parsed).total_seconds()) < 5
+    # Sub-second resolution, so papers imported together don't share a timestamp
+    assert len(now.split('.')[-1]) == 7
+
+
 def test_save_and_load_paper(temp_library):
     """Test saving and loading a paper."""
     now = datetime.utcnow().isoformat() + 'Z'
@@ -184,3 +201,267 @@ def test_delete_nonexistent_paper(temp_library):
     """Test deleting a paper that doesn't exist."""
     result = delete_paper("nonexistent-paper")
     assert result is False
+
+
+def test_tag_updates_return_updated_papers(temp_library):
+    """Test that tag mutators return the saved papers instead of flags."""
+    now = utc_now_iso()
+    for i in range(2):
+        save_paper(Paper(id=f"tag-paper-{i}", title=f"Paper {i}", date_added=now, date_modified=now, tags=["old"]))
+
+    paper = update_tags("tag-paper-0", ["new"])
+    assert paper.tags == ["new"]
+    assert update_tags("missing", ["new"]) is None
+
+    updated = bulk_update_tags(["tag-paper-0", "tag-paper-1", "missing"], ["review"], ["old"])
+    assert [p.id for p in updated] == ["tag-paper-0", "tag-paper-1"]
+    assert load_paper("tag-paper-1").tags == ["review"]
+
+    # Added tags keep their order and aren't duplicated
+    [paper] = bulk_update_tags(["tag-paper-0"], ["x", "review", "y", "x"], ["y"])
+    assert paper.tags == ["new", "review", "x"]
+    assert bulk_update_tags([], ["x"], []) == []
+
+
+def test_list_papers_tracks_saves_and_deletes(temp_library):
+    """Test that the cached paper list and DOI index follow saves and deletes."""
+    now = utc_now_iso()
+    save_paper(Paper(id="uuid-1", doi="10.1000/Mixed.Case", title="Old title", date_added=now, date_modified=now))
+    assert [p.title for p in list_papers()] == ["Old title"]
+    # Found through the DOI index even though the ID isn't the DOI slug
+    assert find_paper_by_doi("10.1000/mixed.case") == "uuid-1"
+
+    paper = load_paper("uuid-1")
+    paper.title = "New title"
+    save_paper(paper)
+    assert [p.title for p in list_papers()] == ["New title"]
+
+    # A fresh scan of the library agrees with the cache
+    invalidate_metadata_cache()
+    assert [p.title for p in list_papers()] == ["New title"]
+
+    delete_paper("uuid-1")
+    assert list_papers() == []
+    assert find_paper_by_doi("10.1000/mixed.case") is None
+
+
+def test_load_paper_builds_nested_models(temp_library):
+    """Test that trusted and legacy paper files both load as full models."""
+    now = utc_now_iso()
+    anchor = HighlightAnchor(start={'page': 1, 'offset': 0}, end={'page': 1, 'offset': 4})
+    save_paper(Paper(
+        id="trusted", title="Trusted", date_added=now, date_modified=now,
+        authors=[Author(name="Jane Roe")],
+        highlights=[Highlight(id="h1", page=1, color="yellow", text="text", anchor=anchor, created_at=now)]
+    ))
+
+    paper = load_paper("trusted")
+    assert isinstance(paper.authors[0], Author)
+    assert isinstance(paper.highlights[0].anchor, HighlightAnchor)
+    assert paper.highlights[0].anchor.end['offset'] == 4
+    assert paper.model_dump()['highlights'][0]['anchor']['start'] == {'page': 1, 'offset': 0}
+
+    # Older files without every field are validated and get defaults
+    json_path, _, _ = get_paper_path("legacy")
+    json_path.write_text('{"id": "legacy", "title": "Legacy", "date_added": "x", "date_modified": "x"}')
+    legacy = load_paper("legacy")
+    assert legacy.tags == []
+    assert legacy.highlights == []
+
+
+def test_load_paper_rejects_malformed_trusted_file(temp_library):
+    """Test that a file with every field but wrong types fails at load time."""
+    now = utc_now_iso()
+    anchor = HighlightAnchor(start={'page': 1, 'offset': 0}, end={'page': 1, 'offset': 4})
+    paper = Paper(
+        id="malformed", title="Malformed", date_added=now, date_modified=now,
+        highlights=[Highlight(id="h1", page=1, color="yellow", text="text", anchor=anchor, created_at=now)]
+    )
+    json_path, _, _ = get_paper_path("malformed")
+
+    data = paper.model_dump()
+    data['tags'] = None
+    json_path.write_bytes(orjson.dumps(data))
+    assert load_paper("malformed") is None
+
+    data = paper.model_dump()
+    data['highlights'][0]['page'] = "one"
+    json_path.write_bytes(orjson.dumps(data))
+    assert load_paper("malformed") is None
+
+
+def test_list_papers_scan_builds_metadata(temp_library):
+    """Test that a fresh scan lists trusted and legacy files without highlights."""
+    now = utc_now_iso()
+    anchor = HighlightAnchor(start={'page': 1, 'offset': 0}, end={'page': 1, 'offset': 4})
+    save_paper(Paper(
+        id="trusted", title="Trusted", date_added=now, date_modified=now,
+        authors=[Author(name="Jane Roe")],
+        highlights=[Highlight(id="h1", page=1, color="yellow", text="text", anchor=anchor, created_at=now)]
+    ))
+    json_path, _, _ = get_paper_path("legacy")
+    json_path.write_text('{"id": "legacy", "title": "Legacy", "date_added": "0", "date_modified": "0", "highlights": []}')
+    invalidate_metadata_cache()
+
+    trusted, legacy = list_papers()
+    assert isinstance(trusted.authors[0], Author)
+    assert trusted.authors[0].name == "Jane Roe"
+    assert "highlights" not in trusted.model_dump()
+    assert (legacy.id, legacy.tags) == ("legacy", [])
+
+
+def test_list_papers_skips_malformed_file(temp_library):
+    """Test that one malformed paper file is left out of the listing."""
+    now = utc_now_iso()
+    save_paper(Paper(id="good", title="Good", date_added=now, date_modified=now))
+    data = Paper(id="bad", title="Bad", date_added=now, date_modified=now).model_dump()
+    data['authors'] = "Jane Roe"
+    json_path, _, _ = get_paper_path("bad")
+    json_path.write_bytes(orjson.dumps(data))
+    invalidate_metadata_cache()
+
+    assert [p.id for p in list_papers()] == ["good"]
+
+
+def test_load_all_papers_refreshes_cache(temp_library):
+    """Test that loading every paper also repopulates the metadata cache."""
+    now = utc_now_iso()
+    save_paper(Paper(id="uuid-2", doi="10.1000/ABC", title="Full", date_added=now, date_modified=now, tags=["a"]))
+    json_path, _, _ = get_paper_path("uuid-2")
+    json_path.with_name("broken.json").write_text("{not json")
+    invalidate_metadata_cache()
+
+    papers = load_all_papers()
+    assert [p.id for p in papers] == ["uuid-2"]
+    assert papers[0].tags == ["a"]
+    assert [p.title for p in list_papers()] == ["Full"]
+    assert find_paper_by_doi("10.1000/abc") == "uuid-2"
+
+
+def test_save_paper_leaves_no_temp_files(temp_library):
+    """Test that atomic saves replace the file and clean up after themselves."""
+    now = utc_now_iso()
+    paper = Paper(id="atomic", title="First", date_added=now, date_modified=now)
+    save_paper(paper)
+    paper.title = "Second"
+    save_paper(paper)
+    save_pdf("atomic", b"%PDF-1.4 test")
+
+    json_path, pdf_path, _ = get_paper_path("atomic")
+    assert load_paper("atomic").title == "Second"
+    assert pdf_path.read_bytes() == b"%PDF-1.4 test"
+    assert list(json_path.parent.glob("*.tmp*")) == []
+    assert list(pdf_path.parent.glob("*.tmp*")) == []
+
+
+def test_extract_text_parallel_matches_sequential(temp_library, monkeypatch):
+    """Test that page-parallel extraction keeps pages in order."""
+    doc = fitz.open()
+    for i in range(20):
+        doc.new_page().insert_text((72, 72), f"Page number {i}")
+    save_pdf("long", doc.tobytes())
+    doc.close()
+
+    monkeypatch.setattr(storage, 'PARALLEL_EXTRACT_MIN_PAGES', 1000)
+    sequential = extract_text_from_pdf("long")
+
+    monkeypatch.setattr(storage, 'PARALLEL_EXTRACT_MIN_PAGES', 4)
+    monkeypatch.setattr(storage, 'EXTRACT_WORKERS', 3)
+    try:
+        parallel = extract_text_from_pdf("long")
+    finally:
+        close_extract_pool()
+
+    assert parallel == sequential
+    assert sequential.index("Page number 3") < sequential.index("Page number 19")
+
+
+def test_highlight_edits_patch_stored_paper(temp_library):
+    """Test that highlight edits update the file and return full models."""
+    now = utc_now_iso()
+    save_paper(Paper(id="hl-paper", title="Highlights", date_added=now, date_modified=now))
+    anchor = HighlightAnchor(start={'page': 2, 'offset': 0}, end={'page': 2, 'offset': 5})
+    highlight = Highlight(id="h1", page=2, color="yellow", text="hello", anchor=anchor, created_at=now)
+
+    paper = add_highlight("hl-paper", highlight)
+    assert isinstance(paper.highlights[0], Highlight)
+    assert add_highlight("missing", highlight) is None
+
+    new_anchor = {'start': {'page': 2, 'offset': 1}, 'end': {'page': 2, 'offset': 4}}
+    paper = update_highlight("hl-paper", "h1", color="green", anchor=new_anchor)
+    assert isinstance(paper.highlights[0].anchor, HighlightAnchor)
+    assert update_highlight("hl-paper", "h2", color="red") is None
+
+    stored = load_paper("hl-paper").highlights[0]
+    assert (stored.color, stored.text, stored.anchor.start['offset']) == ("green", "hello", 1)
+
+    assert delete_highlight("hl-paper", "h2") is None
+    assert delete_highlight("hl-paper", "h1").highlights == []
+    assert load_paper("hl-paper").highlights == []
+
+    # Files missing fields are upgraded when patched
+    json_path, _, _ = get_paper_path("legacy")
+    json_path.write_text('{"id": "legacy", "title": "Legacy", "date_added": "x", "date_modified": "x"}')
+    assert update_tags("legacy", ["t"]).tags == ["t"]
+    assert orjson.loads(json_path.read_bytes())["highlights"] == []
+
+
+def test_save_pdf_drops_stale_extracted_text(temp_library):
+    """Test that a new PDF invalidates text extracted from the previous one."""
+    save_extracted_text("paper", "old text")
+    _, _, text_path = get_paper_path("paper")
+    assert text_path.exists()
+
+    save_pdf("paper", b"%PDF-1.4 new")
+    assert not text_path.exists()
+
+
+def test_failed_atomic_write_keeps_file_and_cleans_up(temp_library, monkeypatch):
+    """Test that a failed save leaves the old file intact and no temp file behind."""
+    now = utc_now_iso()
+    save_paper(Paper(id="atomic", title="First", date_added=now, date_modified=now))
+
+    def fail_replace(src, dst):
+        raise OSError("disk full")
+
+    with monkeypatch.context() as m:
+        m.setattr(storage.os, 'replace', fail_replace)
+        with pytest.raises(OSError):
+            save_paper(Paper(id="atomic", title="Second", date_added=now, date_modified=now))
+
+    json_path, _, _ = get_paper_path("atomic")
+    assert orjson.loads(json_path.read_bytes())["title"] == "First"
+    assert list(json_path.parent.glob("*.tmp")) == []
+
+
+def test_validate_and_extract_text_rejects_unreadable_pdf(temp_library):
+    """Test that a PDF with valid markers but no readable pages is rejected."""
+    doc = fitz.open()
+    doc.new_page().insert_text((72, 72), "Readable body")
+    save_pdf("good", doc.tobytes())
+    doc.close()
+    is_valid, text = validate_and_extract_text("good")
+    assert is_valid
+    assert "Readable body" in text
+
+    save_pdf("bad", b"%PDF-1.4 not really a pdf %%EOF")
+    assert validate_and_extract_text("bad") == (False, None)
+    assert validate_and_extract_text("missing") == (False, None)
+
+    delete_pdf("bad")
+    assert get_pdf_path("bad") is None
+
+
+def test_only_batch_saves_fsync(temp_library, monkeypatch):
+    """Test that single saves and patches skip fsync while batch saves flush once per file plus the directory."""
+    synced = []
+    monkeypatch.setattr(storage.os, 'fsync', synced.append)
+    now = utc_now_iso()
+    papers = [Paper(id=f"sync{i}", title="Sync", date_added=now, date_modified=now) for i in range(3)]
+
+    save_paper(papers[0])
+    update_tags("sync0", ["a"])
+    assert synced == []
+
+    save_papers(papers)
+    assert len(synced) == 4